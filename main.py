@@ -1,18 +1,25 @@
 import asyncio
+import codecs
+import csv
+import hashlib
+import inspect
 import json
 import random
 import re
 import subprocess
 import sys
 import threading
+import time
 import traceback
 import urllib.error
 import urllib.request
 from collections import deque
+from contextlib import contextmanager
 from importlib import import_module
+from itertools import chain
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Awaitable, Callable, Optional
+from typing import Awaitable, Callable, Iterable, Iterator, Optional
 
 from PySide6.QtCore import QTimer
 from PySide6.QtWidgets import (
@@ -45,6 +52,34 @@ SETTINGS_FILE = Path("app_settings.json")
 RETRY_ATTEMPTS = 3
 RETRY_BASE_DELAY = 0.7
 
+# Сколько ID из кэша сессии отправлять в одном get_entity (уходит одним users.getUsers).
+ENTITY_BATCH_SIZE = 50
+# Ошибки, которые повтор не исправит: Telethon так сообщает о несуществующем username/ID.
+ENTITY_GIVEUP_EXCEPTIONS: tuple[type[BaseException], ...] = (ValueError,)
+
+FILE_SOURCE_CHUNK_SIZE = 64 * 1024
+# key поля ввода -> тип списка: от него зависит, какие колонки CSV читать
+FILE_SOURCE_KINDS = {
+    "group_contacts": "contacts",
+    "group_usernames": "usernames",
+    "group_user_ids": "user_ids",
+    "contacts": "contacts",
+    "usernames": "usernames",
+    "user_ids": "user_ids",
+}
+FILE_SOURCE_KEYS = tuple(FILE_SOURCE_KINDS)
+# Узнаваемые заголовки CSV (в нижнем регистре, без пробелов по краям)
+CSV_HEADER_ALIASES = {
+    "name": {"name", "full_name", "fullname", "fio", "фио", "имя", "контакт"},
+    "link": {"phone", "phone_number", "tel", "link", "url", "телефон", "номер", "ссылка"},
+    "username": {"username", "user_name", "login", "link", "url", "ник", "логин", "юзернейм", "ссылка"},
+    "user_id": {"id", "user_id", "userid", "uid", "telegram_id", "tg_id", "ид"},
+}
+
+UI_STALL_INTERVAL_MS = 50
+UI_STALL_THRESHOLD_MS = 200
+UI_STALL_BUCKETS_MS = (250, 500, 1000, 2500, 5000)
+
 
 @dataclass
 class ContactData:
@@ -53,6 +88,282 @@ class ContactData:
     phone: str
 
 
+@dataclass
+class FileSource:
+    # Список участников из TXT/CSV: читается кусками прямо в парсер, в памяти и настройках
+    # хранится только путь и sha256 содержимого.
+    path: str
+    sha256: str = ""
+
+    @property
+    def is_csv(self) -> bool:
+        return Path(self.path).suffix.lower() == ".csv"
+
+    def size_bytes(self) -> int:
+        return Path(self.path).stat().st_size
+
+    def compute_sha256(self, chunk_size: int = FILE_SOURCE_CHUNK_SIZE) -> str:
+        digest = hashlib.sha256()
+        with open(self.path, "rb") as f:
+            while chunk := f.read(chunk_size):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def iter_lines(self, kind: str, chunk_size: int = FILE_SOURCE_CHUNK_SIZE) -> Iterator[str]:
+        if not self.is_csv:
+            yield from self._iter_text_lines(chunk_size)
+            return
+        yield from self._iter_csv_lines(kind, chunk_size)
+
+    def _iter_csv_lines(self, kind: str, chunk_size: int) -> Iterator[str]:
+        # csv.reader получает строки вместе с переводами строк (семантика newline=""),
+        # иначе ячейка в кавычках, занимающая несколько строк, склеится.
+        raw_lines = self._iter_text_lines(chunk_size, keepends=True)
+        first_line = next(raw_lines, "")
+        try:
+            dialect = csv.Sniffer().sniff(first_line, delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel
+        reader = csv.reader(chain([first_line], raw_lines), dialect)
+
+        columns: Optional[dict[str, int]] = None
+        single_column = False
+        for row in reader:
+            cells = [cell.strip() for cell in row]
+            if not any(cells):
+                continue
+            if columns is None:
+                columns, is_header = self._csv_columns(kind, cells)
+                single_column = len(cells) == 1
+                if is_header:
+                    continue
+
+            if kind == "contacts":
+                name = self._csv_cell(cells, columns["name"])
+                link = self._csv_cell(cells, columns["link"])
+                if single_column:
+                    # Одноколоночный CSV в формате текстового поля: ФИО и ссылка чередуются строками.
+                    yield cells[0]
+                elif name or link:
+                    yield name
+                    yield link
+            else:
+                value = self._csv_cell(cells, columns["value"])
+                if value:
+                    yield value
+
+    @staticmethod
+    def _csv_cell(cells: list[str], index: int) -> str:
+        return cells[index] if index < len(cells) else ""
+
+    @staticmethod
+    def _csv_columns(kind: str, first_row: list[str]) -> tuple[dict[str, int], bool]:
+        normalized = [cell.lower() for cell in first_row]
+
+        def find(alias_key: str) -> Optional[int]:
+            return next((i for i, cell in enumerate(normalized) if cell in CSV_HEADER_ALIASES[alias_key]), None)
+
+        def first_matching(predicate: Callable[[str], bool]) -> Optional[int]:
+            return next((i for i, cell in enumerate(first_row) if predicate(cell)), None)
+
+        if kind == "contacts":
+            name_idx, link_idx = find("name"), find("link")
+            is_header = name_idx is not None or link_idx is not None
+            if not is_header:
+                # Без заголовка колонка ссылки — та, где есть телефон (как его ищет parse_contacts) или t.me/+.
+                link_idx = first_matching(lambda cell: "t.me/+" in cell or re.search(r"(?:\+)?\d{10,15}", cell) is not None)
+                if link_idx is not None:
+                    name_idx = next((i for i, cell in enumerate(first_row) if i != link_idx and cell), None)
+            name_idx = name_idx if name_idx is not None else (1 if link_idx == 0 else 0)
+            if link_idx is None:
+                link_idx = 1 if name_idx == 0 else 0
+            return {"name": name_idx, "link": link_idx}, is_header
+
+        value_idx = find("user_id" if kind == "user_ids" else "username")
+        if value_idx is not None:
+            return {"value": value_idx}, True
+        if kind == "user_ids":
+            # Без известного заголовка берём первую колонку с числом; строка без чисел — заголовок.
+            digit_idx = first_matching(str.isdigit)
+            return {"value": digit_idx or 0}, digit_idx is None
+        # Для username — первая колонка с @ или ссылкой t.me/; если таких нет, первая колонка.
+        ref_idx = first_matching(lambda cell: cell.startswith("@") or "t.me/" in cell)
+        return {"value": ref_idx or 0}, False
+
+    def _iter_text_lines(self, chunk_size: int, keepends: bool = False) -> Iterator[str]:
+        digest = hashlib.sha256()
+        decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        # Незавершённая строка копится списком кусков: каждый прочитанный кусок просматривается
+        # один раз, и длинная строка не пересканируется заново на каждом чтении.
+        tail: list[str] = []
+
+        def flush() -> str:
+            line = "".join(tail)
+            tail.clear()
+            return line if keepends else line.splitlines()[0]
+
+        def feed(text: str) -> Iterator[str]:
+            if tail and tail[-1].endswith("\r") and text:
+                # \r\n мог разорваться границей куска.
+                if text.startswith("\n"):
+                    tail.append("\n")
+                    text = text[1:]
+                yield flush()
+            if not text:
+                return
+            *complete, last = text.splitlines(keepends=True)
+            for piece in complete:
+                tail.append(piece)
+                yield flush()
+            tail.append(last)
+            if last.splitlines()[0] != last and not last.endswith("\r"):
+                yield flush()
+
+        with open(self.path, "rb") as f:
+            while chunk := f.read(chunk_size):
+                digest.update(chunk)
+                yield from feed(decoder.decode(chunk))
+        yield from feed(decoder.decode(b"", final=True))
+        if tail:
+            yield flush()
+        self.sha256 = digest.hexdigest()
+
+
+@dataclass
+class UiStall:
+    lateness_ms: float
+    handler: str
+
+
+class UiStallMonitor:
+    # Heartbeat: таймер тикает каждые interval_ms, опоздание тика = время, на которое был занят UI-поток.
+    # Обработчики, которые могут блокировать UI, оборачиваются в track(name) — так зависание
+    # можно приписать конкретному обработчику или сигналу.
+    def __init__(
+        self,
+        *,
+        interval_ms: int = UI_STALL_INTERVAL_MS,
+        threshold_ms: int = UI_STALL_THRESHOLD_MS,
+        on_stall: Optional[Callable[[UiStall], None]] = None,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self.interval_ms = interval_ms
+        self.threshold_ms = threshold_ms
+        self.on_stall = on_stall
+        self._clock = clock
+        self._timer: Optional[QTimer] = None
+        self._last_tick: Optional[float] = None
+        self._active: list[str] = []
+        self._ran_since_tick: list[tuple[str, float]] = []
+        self.stalls: list[UiStall] = []
+        self.max_lateness_ms = 0.0
+        self.histogram: dict[str, int] = {self._bucket_label(b): 0 for b in (*UI_STALL_BUCKETS_MS, None)}
+
+    @staticmethod
+    def _bucket_label(upper_ms: Optional[int]) -> str:
+        return f"<={upper_ms}ms" if upper_ms is not None else f">{UI_STALL_BUCKETS_MS[-1]}ms"
+
+    def start(self, parent: object = None) -> None:
+        if self._timer is None:
+            self._timer = QTimer(parent)
+            self._timer.setInterval(self.interval_ms)
+            self._timer.timeout.connect(self.record_tick)
+        self._last_tick = self._clock()
+        self._ran_since_tick.clear()
+        self._timer.start()
+
+    def stop(self) -> None:
+        if self._timer is not None:
+            self._timer.stop()
+        self._last_tick = None
+
+    @contextmanager
+    def track(self, name: str) -> Iterator[None]:
+        self._active.append(name)
+        started = self._clock()
+        try:
+            yield
+        finally:
+            self._active.pop()
+            duration = self._clock() - started
+            self._ran_since_tick.append((name, duration))
+            # До start() (например, _load_settings в конструкторе) тиков нет — меряем сам обработчик.
+            if self._last_tick is None and not self._active and duration * 1000 >= self.threshold_ms:
+                self._record_stall(duration * 1000, name)
+
+    def wrap(self, name: str, slot: Callable[..., object]) -> Callable[..., object]:
+        # Qt передаёт слоту аргументы сигнала; отрезаем лишние, как это делает сам Qt для обычного слота.
+        try:
+            params = inspect.signature(slot).parameters.values()
+        except (TypeError, ValueError):
+            max_args = None
+        else:
+            if any(p.kind == p.VAR_POSITIONAL for p in params):
+                max_args = None
+            else:
+                max_args = sum(1 for p in params if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD))
+
+        def _tracked(*args: object) -> object:
+            with self.track(name):
+                return slot(*(args if max_args is None else args[:max_args]))
+
+        return _tracked
+
+    def record_tick(self, now: Optional[float] = None) -> float:
+        now = self._clock() if now is None else now
+        if self._last_tick is None:
+            self._last_tick = now
+            return 0.0
+
+        lateness_ms = max(0.0, (now - self._last_tick) * 1000 - self.interval_ms)
+        self._last_tick = now
+        handler = self._current_handler()
+        self._ran_since_tick.clear()
+
+        if lateness_ms >= self.threshold_ms:
+            self._record_stall(lateness_ms, handler)
+        else:
+            self.max_lateness_ms = max(self.max_lateness_ms, lateness_ms)
+        return lateness_ms
+
+    def _record_stall(self, lateness_ms: float, handler: str) -> None:
+        self.max_lateness_ms = max(self.max_lateness_ms, lateness_ms)
+        stall = UiStall(lateness_ms=lateness_ms, handler=handler)
+        self.stalls.append(stall)
+        self.histogram[self._bucket_for(lateness_ms)] += 1
+        if self.on_stall:
+            self.on_stall(stall)
+
+    def _current_handler(self) -> str:
+        # Тик внутри вложенного event loop (например, QMessageBox) — виноват активный обработчик.
+        if self._active:
+            return self._active[-1]
+        if self._ran_since_tick:
+            return max(self._ran_since_tick, key=lambda item: item[1])[0]
+        return "<неизвестно>"
+
+    def _bucket_for(self, lateness_ms: float) -> str:
+        for upper in UI_STALL_BUCKETS_MS:
+            if lateness_ms <= upper:
+                return self._bucket_label(upper)
+        return self._bucket_label(None)
+
+    def assert_max_block(self, budget_ms: float) -> None:
+        if self.max_lateness_ms > budget_ms:
+            worst = max(self.stalls, key=lambda s: s.lateness_ms, default=None)
+            culprit = f" ({worst.handler})" if worst is not None else ""
+            raise AssertionError(
+                f"UI-поток заблокирован на {self.max_lateness_ms:.0f} мс{culprit}, бюджет {budget_ms:.0f} мс"
+            )
+
+    def reset(self) -> None:
+        self.stalls.clear()
+        self.max_lateness_ms = 0.0
+        self._ran_since_tick.clear()
+        for key in self.histogram:
+            self.histogram[key] = 0
+
+
 class MainWindow(QMainWindow):
     def __init__(self) -> None:
         super().__init__()
@@ -67,6 +378,7 @@ class MainWindow(QMainWindow):
         self.phone_code_hash: Optional[str] = None
         self._phone_code_target: str = ""
         self._loading_settings = False
+        self._stall_monitor = UiStallMonitor(on_stall=self._on_ui_stall)
 
         # global app credentials (API ID + API HASH) used for login and all operations
         self.api_id_input = QLineEdit()
@@ -103,7 +415,7 @@ class MainWindow(QMainWindow):
         self._update_request_in_flight = False
         self._update_poll_timer = QTimer(self)
         self._update_poll_timer.setInterval(15000)
-        self._update_poll_timer.timeout.connect(self._poll_update_server_async)
+        self._connect(self._update_poll_timer.timeout, self._poll_update_server_async, "_update_poll_timer.timeout")
 
         # Active Telegram account (single profile)
         self.account_phone_input = QLineEdit()
@@ -208,6 +520,17 @@ class MainWindow(QMainWindow):
         self.user_ids_input.setPlaceholderText("123456789\n987654321")
         self.btn_add_users_only = QPushButton("Проверить и добавить пользователей")
 
+        # member lists loaded from TXT/CSV instead of the text fields
+        self._file_sources: dict[str, FileSource] = {}
+        self._source_inputs: dict[str, QPlainTextEdit] = {
+            "group_contacts": self.group_contacts_input,
+            "group_usernames": self.group_usernames_input,
+            "group_user_ids": self.group_user_ids_input,
+            "contacts": self.contacts_input,
+            "usernames": self.usernames_input,
+            "user_ids": self.user_ids_input,
+        }
+
         self.log_output = QPlainTextEdit()
         self.log_output.setReadOnly(True)
         self.log_output.setMaximumBlockCount(0)
@@ -222,7 +545,9 @@ class MainWindow(QMainWindow):
         self._build_tabs()
         self._bind_events()
         self._setup_ui_hints()
-        self._load_settings()
+        with self._stall_monitor.track("_load_settings"):
+            self._load_settings()
+        self._stall_monitor.start(self)
 
     def _setup_ui_hints(self) -> None:
         self.statusBar().showMessage("Готово к работе")
@@ -266,7 +591,11 @@ class MainWindow(QMainWindow):
         self.tabs.addTab(self.page_accounts, "Аккаунты")
         self.tabs.addTab(self.page_groups, "Группы")
         self.tabs.addTab(self.page_contacts, "Контакты")
-        self.tabs.currentChanged.connect(lambda i: self.statusBar().showMessage(f"Раздел: {self.tabs.tabText(i)}"))
+        self._connect(
+            self.tabs.currentChanged,
+            lambda i: self.statusBar().showMessage(f"Раздел: {self.tabs.tabText(i)}"),
+            "tabs.currentChanged",
+        )
         self.setCentralWidget(self.tabs)
 
     def _build_accounts_page(self) -> None:
@@ -375,18 +704,21 @@ class MainWindow(QMainWindow):
         group_contacts_l = QVBoxLayout(group_contacts_box)
         self.group_contacts_input.setFixedHeight(130)
         group_contacts_l.addWidget(self.group_contacts_input)
+        group_contacts_l.addWidget(self._file_source_row("group_contacts"))
         layout.addWidget(group_contacts_box)
 
         group_refs_box = QGroupBox("Юзернеймы/ссылки для групп")
         group_refs_l = QVBoxLayout(group_refs_box)
         self.group_usernames_input.setFixedHeight(100)
         group_refs_l.addWidget(self.group_usernames_input)
+        group_refs_l.addWidget(self._file_source_row("group_usernames"))
         layout.addWidget(group_refs_box)
 
         group_ids_box = QGroupBox("ID пользователей для групп")
         group_ids_l = QVBoxLayout(group_ids_box)
         self.group_user_ids_input.setFixedHeight(80)
         group_ids_l.addWidget(self.group_user_ids_input)
+        group_ids_l.addWidget(self._file_source_row("group_user_ids"))
         layout.addWidget(group_ids_box)
 
         btn_row = QWidget()
@@ -407,18 +739,21 @@ class MainWindow(QMainWindow):
         c_l.addWidget(QLabel("ФИО + ссылка t.me/+7... блоками"))
         self.contacts_input.setFixedHeight(220)
         c_l.addWidget(self.contacts_input)
+        c_l.addWidget(self._file_source_row("contacts"))
         layout.addWidget(contacts_box)
 
         refs_box = QGroupBox("Юзернеймы и ссылки")
         r_l = QVBoxLayout(refs_box)
         self.usernames_input.setFixedHeight(120)
         r_l.addWidget(self.usernames_input)
+        r_l.addWidget(self._file_source_row("usernames"))
         layout.addWidget(refs_box)
 
         ids_box = QGroupBox("ID пользователей")
         i_l = QVBoxLayout(ids_box)
         self.user_ids_input.setFixedHeight(90)
         i_l.addWidget(self.user_ids_input)
+        i_l.addWidget(self._file_source_row("user_ids"))
         i_l.addWidget(QLabel("Можно оставить пустым, если хотите работать только с контактами/username."))
 
         delay_row = QWidget()
@@ -434,6 +769,19 @@ class MainWindow(QMainWindow):
         i_l.addWidget(self.btn_add_users_only)
         layout.addWidget(ids_box)
 
+    def _file_source_row(self, key: str) -> QWidget:
+        row = QWidget()
+        row_l = QHBoxLayout(row)
+        row_l.setContentsMargins(0, 0, 0, 0)
+        btn_pick = QPushButton("Загрузить из файла (TXT/CSV)")
+        btn_clear = QPushButton("Убрать файл")
+        self._connect(btn_pick.clicked, lambda: self.pick_source_file(key), f"{key}.pick_file.clicked")
+        self._connect(btn_clear.clicked, lambda: self.clear_source_file(key), f"{key}.clear_file.clicked")
+        row_l.addWidget(btn_pick)
+        row_l.addWidget(btn_clear)
+        row_l.addStretch(1)
+        return row
+
     @staticmethod
     def _to_int(value: object, default: int) -> int:
         try:
@@ -460,76 +808,94 @@ class MainWindow(QMainWindow):
             return
         self._save_settings()
 
+    def _connect(self, signal: object, slot: Callable[..., object], signal_name: str) -> None:
+        # Каждый слот идёт через монитор зависаний, чтобы в логе было видно, какой сигнал/обработчик занял UI.
+        slot_name = getattr(slot, "__name__", "")
+        name = signal_name if slot_name in {"", "<lambda>"} else f"{signal_name} -> {slot_name}"
+        signal.connect(self._stall_monitor.wrap(name, slot))
+
     def _bind_events(self) -> None:
-        self.btn_save_api.clicked.connect(self.save_api_pair)
-        self.btn_check_proxy.clicked.connect(self.check_proxy)
-
-        self.btn_save_account.clicked.connect(self.save_account)
-        self.btn_change_account.clicked.connect(self.change_account)
-        self.account_phone_input.textChanged.connect(lambda text: self.phone_input.setText(self.normalize_phone(text)))
-        self.account_phone_input.textChanged.connect(self._save_settings)
-
-        self.proxy_enabled_checkbox.toggled.connect(lambda _: self._sync_proxy_controls())
-        self.proxy_enabled_checkbox.toggled.connect(lambda _: self._save_settings())
-        self.proxy_type_combo.currentIndexChanged.connect(lambda _: self._save_settings())
-        self.proxy_host_input.textChanged.connect(self._save_settings)
-        self.proxy_port_spin.valueChanged.connect(lambda _: self._save_settings())
-        self.proxy_username_input.textChanged.connect(self._save_settings)
-        self.proxy_password_input.textChanged.connect(self._save_settings)
-        self.ip_update_input.textChanged.connect(self._save_settings)
-        self.update_poll_checkbox.toggled.connect(lambda _: self._on_update_polling_changed())
-        self.update_ask_user_checkbox.toggled.connect(lambda _: self._save_settings())
-        self.btn_check_updates.clicked.connect(self._poll_update_server_async)
-
-        self.btn_request_code.clicked.connect(self.request_code)
-        self.btn_sign_in.clicked.connect(self.sign_in)
-        self.btn_pick_photo.clicked.connect(self.pick_photo)
-        self.btn_create_with_members.clicked.connect(lambda: self.create_groups(add_members=True))
-        self.btn_create_without_members.clicked.connect(lambda: self.create_groups(add_members=False))
-        self.btn_retry_failed_groups.clicked.connect(self.retry_failed_groups)
-        self.btn_add_users_only.clicked.connect(self.add_users_without_groups)
-
-        self.contacts_random_delay_checkbox.toggled.connect(
-            lambda _: self._sync_delay_controls(self.contacts_random_delay_checkbox, self.contacts_delay_min_spin, self.contacts_delay_max_spin)
+        self._connect(self.btn_save_api.clicked, self.save_api_pair, "btn_save_api.clicked")
+        self._connect(self.btn_check_proxy.clicked, self.check_proxy, "btn_check_proxy.clicked")
+
+        self._connect(self.btn_save_account.clicked, self.save_account, "btn_save_account.clicked")
+        self._connect(self.btn_change_account.clicked, self.change_account, "btn_change_account.clicked")
+        self._connect(self.account_phone_input.textChanged, lambda text: self.phone_input.setText(self.normalize_phone(text)), "account_phone_input.textChanged")
+        self._connect(self.account_phone_input.textChanged, self._save_settings, "account_phone_input.textChanged")
+
+        self._connect(self.proxy_enabled_checkbox.toggled, lambda _: self._sync_proxy_controls(), "proxy_enabled_checkbox.toggled")
+        self._connect(self.proxy_enabled_checkbox.toggled, lambda _: self._save_settings(), "proxy_enabled_checkbox.toggled")
+        self._connect(self.proxy_type_combo.currentIndexChanged, lambda _: self._save_settings(), "proxy_type_combo.currentIndexChanged")
+        self._connect(self.proxy_host_input.textChanged, self._save_settings, "proxy_host_input.textChanged")
+        self._connect(self.proxy_port_spin.valueChanged, lambda _: self._save_settings(), "proxy_port_spin.valueChanged")
+        self._connect(self.proxy_username_input.textChanged, self._save_settings, "proxy_username_input.textChanged")
+        self._connect(self.proxy_password_input.textChanged, self._save_settings, "proxy_password_input.textChanged")
+        self._connect(self.ip_update_input.textChanged, self._save_settings, "ip_update_input.textChanged")
+        self._connect(self.update_poll_checkbox.toggled, lambda _: self._on_update_polling_changed(), "update_poll_checkbox.toggled")
+        self._connect(self.update_ask_user_checkbox.toggled, lambda _: self._save_settings(), "update_ask_user_checkbox.toggled")
+        self._connect(self.btn_check_updates.clicked, self._poll_update_server_async, "btn_check_updates.clicked")
+
+        self._connect(self.btn_request_code.clicked, self.request_code, "btn_request_code.clicked")
+        self._connect(self.btn_sign_in.clicked, self.sign_in, "btn_sign_in.clicked")
+        self._connect(self.btn_pick_photo.clicked, self.pick_photo, "btn_pick_photo.clicked")
+        self._connect(self.btn_create_with_members.clicked, lambda: self.create_groups(add_members=True), "btn_create_with_members.clicked")
+        self._connect(self.btn_create_without_members.clicked, lambda: self.create_groups(add_members=False), "btn_create_without_members.clicked")
+        self._connect(self.btn_retry_failed_groups.clicked, self.retry_failed_groups, "btn_retry_failed_groups.clicked")
+        self._connect(self.btn_add_users_only.clicked, self.add_users_without_groups, "btn_add_users_only.clicked")
+
+        self._connect(
+            self.contacts_random_delay_checkbox.toggled,
+            lambda _: self._sync_delay_controls(self.contacts_random_delay_checkbox, self.contacts_delay_min_spin, self.contacts_delay_max_spin),
+            "contacts_random_delay_checkbox.toggled",
         )
-        self.groups_random_delay_checkbox.toggled.connect(
-            lambda _: self._sync_delay_controls(self.groups_random_delay_checkbox, self.groups_delay_min_spin, self.groups_delay_max_spin)
+        self._connect(
+            self.groups_random_delay_checkbox.toggled,
+            lambda _: self._sync_delay_controls(self.groups_random_delay_checkbox, self.groups_delay_min_spin, self.groups_delay_max_spin),
+            "groups_random_delay_checkbox.toggled",
         )
-        self.contacts_delay_min_spin.valueChanged.connect(
-            lambda _: self._sync_delay_controls(self.contacts_random_delay_checkbox, self.contacts_delay_min_spin, self.contacts_delay_max_spin)
+        self._connect(
+            self.contacts_delay_min_spin.valueChanged,
+            lambda _: self._sync_delay_controls(self.contacts_random_delay_checkbox, self.contacts_delay_min_spin, self.contacts_delay_max_spin),
+            "contacts_delay_min_spin.valueChanged",
         )
-        self.groups_delay_min_spin.valueChanged.connect(
-            lambda _: self._sync_delay_controls(self.groups_random_delay_checkbox, self.groups_delay_min_spin, self.groups_delay_max_spin)
+        self._connect(
+            self.groups_delay_min_spin.valueChanged,
+            lambda _: self._sync_delay_controls(self.groups_random_delay_checkbox, self.groups_delay_min_spin, self.groups_delay_max_spin),
+            "groups_delay_min_spin.valueChanged",
         )
-        self.contacts_delay_max_spin.valueChanged.connect(
-            lambda _: self._sync_delay_controls(self.contacts_random_delay_checkbox, self.contacts_delay_min_spin, self.contacts_delay_max_spin)
+        self._connect(
+            self.contacts_delay_max_spin.valueChanged,
+            lambda _: self._sync_delay_controls(self.contacts_random_delay_checkbox, self.contacts_delay_min_spin, self.contacts_delay_max_spin),
+            "contacts_delay_max_spin.valueChanged",
         )
-        self.groups_delay_max_spin.valueChanged.connect(
-            lambda _: self._sync_delay_controls(self.groups_random_delay_checkbox, self.groups_delay_min_spin, self.groups_delay_max_spin)
+        self._connect(
+            self.groups_delay_max_spin.valueChanged,
+            lambda _: self._sync_delay_controls(self.groups_random_delay_checkbox, self.groups_delay_min_spin, self.groups_delay_max_spin),
+            "groups_delay_max_spin.valueChanged",
         )
-        self.group_type_combo.currentIndexChanged.connect(lambda _: self._sync_forum_controls())
-
-        self.auth_delay_spin.valueChanged.connect(lambda _: self._on_delay_controls_changed())
-        self.contacts_delay_min_spin.valueChanged.connect(lambda _: self._on_delay_controls_changed())
-        self.contacts_delay_max_spin.valueChanged.connect(lambda _: self._on_delay_controls_changed())
-        self.contacts_random_delay_checkbox.toggled.connect(lambda _: self._on_delay_controls_changed())
-        self.groups_delay_min_spin.valueChanged.connect(lambda _: self._on_delay_controls_changed())
-        self.groups_delay_max_spin.valueChanged.connect(lambda _: self._on_delay_controls_changed())
-        self.groups_random_delay_checkbox.toggled.connect(lambda _: self._on_delay_controls_changed())
-
-        self.group_use_contacts_checkbox.toggled.connect(lambda _: self._save_settings())
-        self.group_use_usernames_checkbox.toggled.connect(lambda _: self._save_settings())
-        self.group_use_ids_checkbox.toggled.connect(lambda _: self._save_settings())
-        self.use_members_checkbox.toggled.connect(lambda _: self._sync_group_member_inputs())
-        self.group_use_contacts_checkbox.toggled.connect(lambda _: self._sync_group_member_inputs())
-        self.group_use_usernames_checkbox.toggled.connect(lambda _: self._sync_group_member_inputs())
-        self.group_use_ids_checkbox.toggled.connect(lambda _: self._sync_group_member_inputs())
-        self.group_type_combo.currentIndexChanged.connect(lambda _: self._save_settings())
-        self.topic_preset_combo.currentIndexChanged.connect(lambda _: self._save_settings())
-        self.topic_custom_input.textChanged.connect(self._save_settings)
-        self.group_contacts_input.textChanged.connect(self._save_settings)
-        self.group_usernames_input.textChanged.connect(self._save_settings)
-        self.group_user_ids_input.textChanged.connect(self._save_settings)
+        self._connect(self.group_type_combo.currentIndexChanged, lambda _: self._sync_forum_controls(), "group_type_combo.currentIndexChanged")
+
+        self._connect(self.auth_delay_spin.valueChanged, lambda _: self._on_delay_controls_changed(), "auth_delay_spin.valueChanged")
+        self._connect(self.contacts_delay_min_spin.valueChanged, lambda _: self._on_delay_controls_changed(), "contacts_delay_min_spin.valueChanged")
+        self._connect(self.contacts_delay_max_spin.valueChanged, lambda _: self._on_delay_controls_changed(), "contacts_delay_max_spin.valueChanged")
+        self._connect(self.contacts_random_delay_checkbox.toggled, lambda _: self._on_delay_controls_changed(), "contacts_random_delay_checkbox.toggled")
+        self._connect(self.groups_delay_min_spin.valueChanged, lambda _: self._on_delay_controls_changed(), "groups_delay_min_spin.valueChanged")
+        self._connect(self.groups_delay_max_spin.valueChanged, lambda _: self._on_delay_controls_changed(), "groups_delay_max_spin.valueChanged")
+        self._connect(self.groups_random_delay_checkbox.toggled, lambda _: self._on_delay_controls_changed(), "groups_random_delay_checkbox.toggled")
+
+        self._connect(self.group_use_contacts_checkbox.toggled, lambda _: self._save_settings(), "group_use_contacts_checkbox.toggled")
+        self._connect(self.group_use_usernames_checkbox.toggled, lambda _: self._save_settings(), "group_use_usernames_checkbox.toggled")
+        self._connect(self.group_use_ids_checkbox.toggled, lambda _: self._save_settings(), "group_use_ids_checkbox.toggled")
+        self._connect(self.use_members_checkbox.toggled, lambda _: self._sync_group_member_inputs(), "use_members_checkbox.toggled")
+        self._connect(self.group_use_contacts_checkbox.toggled, lambda _: self._sync_group_member_inputs(), "group_use_contacts_checkbox.toggled")
+        self._connect(self.group_use_usernames_checkbox.toggled, lambda _: self._sync_group_member_inputs(), "group_use_usernames_checkbox.toggled")
+        self._connect(self.group_use_ids_checkbox.toggled, lambda _: self._sync_group_member_inputs(), "group_use_ids_checkbox.toggled")
+        self._connect(self.group_type_combo.currentIndexChanged, lambda _: self._save_settings(), "group_type_combo.currentIndexChanged")
+        self._connect(self.topic_preset_combo.currentIndexChanged, lambda _: self._save_settings(), "topic_preset_combo.currentIndexChanged")
+        self._connect(self.topic_custom_input.textChanged, self._save_settings, "topic_custom_input.textChanged")
+        self._connect(self.group_contacts_input.textChanged, self._save_settings, "group_contacts_input.textChanged")
+        self._connect(self.group_usernames_input.textChanged, self._save_settings, "group_usernames_input.textChanged")
+        self._connect(self.group_user_ids_input.textChanged, self._save_settings, "group_user_ids_input.textChanged")
 
     def _load_settings(self) -> None:
         data = {}
@@ -594,6 +960,12 @@ class MainWindow(QMainWindow):
             self.group_usernames_input.setPlainText(str(group_members.get("usernames", "")))
             self.group_user_ids_input.setPlainText(str(group_members.get("user_ids", "")))
 
+            file_sources = data.get("file_sources", {}) if isinstance(data, dict) else {}
+            for key in FILE_SOURCE_KEYS:
+                item = file_sources.get(key) if isinstance(file_sources, dict) else None
+                if isinstance(item, dict) and str(item.get("path", "")).strip():
+                    self._set_file_source(key, FileSource(str(item["path"]).strip(), str(item.get("sha256", ""))))
+
             group_options = data.get("group_options", {}) if isinstance(data, dict) else {}
             self._set_combo_by_data(self.group_type_combo, str(group_options.get("type", self.group_type_combo.currentData())))
             self._set_combo_by_data(
@@ -615,7 +987,12 @@ class MainWindow(QMainWindow):
     def _save_settings(self) -> None:
         if self._loading_settings:
             return
-        payload = {
+        with self._stall_monitor.track("_save_settings"):
+            payload = self._settings_payload()
+            SETTINGS_FILE.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    def _settings_payload(self) -> dict[str, object]:
+        return {
             "api": {
                 "api_id": self.api_id_input.text().strip(),
                 "api_hash": self.api_hash_input.text().strip(),
@@ -649,9 +1026,12 @@ class MainWindow(QMainWindow):
                 "use_contacts": self.group_use_contacts_checkbox.isChecked(),
                 "use_usernames": self.group_use_usernames_checkbox.isChecked(),
                 "use_ids": self.group_use_ids_checkbox.isChecked(),
-                "contacts": self.group_contacts_input.toPlainText(),
-                "usernames": self.group_usernames_input.toPlainText(),
-                "user_ids": self.group_user_ids_input.toPlainText(),
+                "contacts": self._input_text_for_settings("group_contacts"),
+                "usernames": self._input_text_for_settings("group_usernames"),
+                "user_ids": self._input_text_for_settings("group_user_ids"),
+            },
+            "file_sources": {
+                key: {"path": source.path, "sha256": source.sha256} for key, source in self._file_sources.items()
             },
             "group_options": {
                 "type": self.group_type_combo.currentData(),
@@ -659,7 +1039,12 @@ class MainWindow(QMainWindow):
                 "topic_custom": self.topic_custom_input.text().strip(),
             },
         }
-        SETTINGS_FILE.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    def _input_text_for_settings(self, key: str) -> str:
+        # Для файлового источника в поле лишь сводка — её не сохраняем, в настройках остаются путь и хэш.
+        if key in self._file_sources:
+            return ""
+        return self._source_inputs[key].toPlainText()
 
     def _set_combo_by_data(self, combo: QComboBox, value: str) -> None:
         idx = combo.findData(value)
@@ -763,6 +1148,7 @@ class MainWindow(QMainWindow):
         attempts: int = RETRY_ATTEMPTS,
         base_delay: float = RETRY_BASE_DELAY,
         retry_exceptions: tuple[type[BaseException], ...] = (Exception,),
+        giveup_exceptions: tuple[type[BaseException], ...] = (),
         on_retry: Optional[Callable[[int, BaseException], None]] = None,
     ) -> object:
         if attempts < 1:
@@ -773,6 +1159,8 @@ class MainWindow(QMainWindow):
             try:
                 return await operation()
             except retry_exceptions as exc:  # noqa: PERF203
+                if isinstance(exc, giveup_exceptions):
+                    raise
                 last_exc = exc
                 if attempt >= attempts:
                     break
@@ -786,23 +1174,33 @@ class MainWindow(QMainWindow):
             raise last_exc
         raise RuntimeError("retry_async завершился без результата")
 
-    async def wait_contacts_delay(self) -> None:
+    @staticmethod
+    async def _sleep_while_preparing(delay: float, prepare: Optional[Callable[[], object]] = None) -> object:
+        # Локальная подготовка следующего шага идёт в счёт паузы: отсчёт начинается до prepare(),
+        # поэтому между запросами проходит ровно delay, а не delay + время подготовки.
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + delay
+        prepared = prepare() if prepare else None
+        remaining = deadline - loop.time()
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+        return prepared
+
+    async def wait_contacts_delay(self, prepare: Optional[Callable[[], object]] = None) -> object:
         delay = self._get_delay(
             self.contacts_delay_min_spin.value(),
             self.contacts_delay_max_spin.value(),
             self.contacts_random_delay_checkbox.isChecked(),
         )
-        if delay > 0:
-            await asyncio.sleep(delay)
+        return await self._sleep_while_preparing(delay, prepare)
 
-    async def wait_groups_delay(self) -> None:
+    async def wait_groups_delay(self, prepare: Optional[Callable[[], object]] = None) -> object:
         delay = self._get_delay(
             self.groups_delay_min_spin.value(),
             self.groups_delay_max_spin.value(),
             self.groups_random_delay_checkbox.isChecked(),
         )
-        if delay > 0:
-            await asyncio.sleep(delay)
+        return await self._sleep_while_preparing(delay, prepare)
 
     @staticmethod
     def _sync_delay_controls(random_checkbox: QCheckBox, min_spin: QSpinBox, max_spin: QSpinBox) -> None:
@@ -857,14 +1255,20 @@ class MainWindow(QMainWindow):
 
         fn, success_cb = self._task_queue.popleft()
         try:
-            result = fn()
-            if success_cb:
-                success_cb(result)
+            with self._stall_monitor.track(getattr(fn, "__qualname__", "task")):
+                result = fn()
+                if success_cb:
+                    success_cb(result)
         except Exception as exc:  # noqa: BLE001
             self.show_error(str(exc), exc)
         finally:
             self._process_next_task()
 
+    def _on_ui_stall(self, stall: UiStall) -> None:
+        message = f"[UI] Интерфейс не отвечал {stall.lateness_ms:.0f} мс: {stall.handler}"
+        self.log(message)
+        print(message, file=sys.stderr)
+
     def set_busy(self, busy: bool) -> None:
         _ = busy
 
@@ -898,18 +1302,21 @@ class MainWindow(QMainWindow):
         return f"tg_session_{digits}"
 
     @staticmethod
-    def parse_contacts(raw: str) -> list[ContactData]:
-        lines = [line.strip() for line in raw.splitlines()]
+    def _iter_lines(raw: str | Iterable[str]) -> Iterable[str]:
+        return raw.splitlines() if isinstance(raw, str) else raw
+
+    @staticmethod
+    def parse_contacts(raw: str | Iterable[str]) -> list[ContactData]:
+        lines = iter(MainWindow._iter_lines(raw))
         contacts: list[ContactData] = []
-        i = 0
-        while i < len(lines):
-            if not lines[i]:
-                i += 1
+        for line in lines:
+            person_line = line.strip()
+            if not person_line:
                 continue
-            person_line = lines[i]
-            if i + 1 >= len(lines):
+            link_line = next(lines, None)
+            if link_line is None:
                 raise ValueError(f"Нет ссылки для строки: {person_line}")
-            link_line = lines[i + 1]
+            link_line = link_line.strip()
 
             full_name = re.sub(r"\s+", " ", person_line).strip()
             tokens = [t for t in full_name.split() if t]
@@ -925,13 +1332,12 @@ class MainWindow(QMainWindow):
                 raise ValueError(f"Не удалось извлечь телефон: {link_line}")
 
             contacts.append(ContactData(first_name=full_name, last_name="", phone=phone))
-            i += 2
         return contacts
 
     @staticmethod
-    def parse_user_refs(raw: str) -> list[str]:
+    def parse_user_refs(raw: str | Iterable[str]) -> list[str]:
         refs: list[str] = []
-        for line in raw.splitlines():
+        for line in MainWindow._iter_lines(raw):
             x = line.strip()
             if not x:
                 continue
@@ -948,9 +1354,9 @@ class MainWindow(QMainWindow):
         return refs
 
     @staticmethod
-    def parse_user_ids(raw: str) -> list[int]:
+    def parse_user_ids(raw: str | Iterable[str]) -> list[int]:
         ids: list[int] = []
-        for line in raw.splitlines():
+        for line in MainWindow._iter_lines(raw):
             v = line.strip()
             if not v:
                 continue
@@ -967,9 +1373,82 @@ class MainWindow(QMainWindow):
             _op,
             attempts=RETRY_ATTEMPTS,
             base_delay=RETRY_BASE_DELAY,
+            giveup_exceptions=ENTITY_GIVEUP_EXCEPTIONS,
             on_retry=lambda attempt, exc: self.log(f"retry get_entity({value}) attempt={attempt + 1}: {exc}"),
         )
 
+    async def _resolve_entities_paced(
+        self,
+        client: TelegramClient,
+        values: list[str] | list[int],
+        *,
+        wait: Optional[Callable[[], Awaitable[object]]] = None,
+    ) -> list[tuple[str | int, object, Optional[Exception]]]:
+        # Username Telethon всё равно резолвит отдельным resolveUsername на каждое значение,
+        # поэтому их не пакуем: пауза между запросами защищает от FloodWait.
+        results: list[tuple[str | int, object, Optional[Exception]]] = []
+        for value in values:
+            if wait is not None:
+                await wait()
+            try:
+                results.append((value, await self._get_entity_with_retry(client, value), None))
+            except Exception as exc:  # noqa: BLE001
+                results.append((value, None, exc))
+        return results
+
+    @staticmethod
+    def _is_cached_user_id(client: TelegramClient, user_id: int) -> bool:
+        # Только локальная sqlite-сессия, без сети: неизвестный ID не должен ронять целую пачку.
+        try:
+            client.session.get_input_entity(user_id)
+        except Exception:  # noqa: BLE001
+            return False
+        return True
+
+    async def _resolve_user_ids_batched(
+        self,
+        client: TelegramClient,
+        user_ids: list[int],
+        *,
+        wait: Optional[Callable[[], Awaitable[object]]] = None,
+        batch_size: int = ENTITY_BATCH_SIZE,
+    ) -> list[tuple[int, object, Optional[Exception]]]:
+        if batch_size < 1:
+            raise ValueError("batch_size должен быть >= 1")
+
+        unique_ids = list(dict.fromkeys(user_ids))
+        cached = [uid for uid in unique_ids if self._is_cached_user_id(client, uid)]
+        resolved: dict[int, tuple[object, Optional[Exception]]] = {}
+        for start in range(0, len(cached), batch_size):
+            batch = cached[start:start + batch_size]
+            if wait is not None:
+                await wait()
+
+            async def _op(batch: list[int] = batch) -> object:
+                return await client.get_entity(batch)
+
+            try:
+                entities = await self.retry_async(
+                    _op,
+                    attempts=RETRY_ATTEMPTS,
+                    base_delay=RETRY_BASE_DELAY,
+                    giveup_exceptions=ENTITY_GIVEUP_EXCEPTIONS,
+                    on_retry=lambda attempt, exc, n=len(batch): self.log(
+                        f"retry get_entity(batch={n}) attempt={attempt + 1}: {exc}"
+                    ),
+                )
+            except Exception as exc:  # noqa: BLE001
+                self.log(f"get_entity(batch={len(batch)}) не удался, поштучная проверка: {exc}")
+                for uid, entity, item_exc in await self._resolve_entities_paced(client, batch, wait=wait):
+                    resolved[uid] = (entity, item_exc)
+                continue
+            for uid, entity in zip(batch, entities):
+                resolved[uid] = (entity, None)
+
+        unknown = [uid for uid in unique_ids if uid not in resolved]
+        for uid, entity, exc in await self._resolve_entities_paced(client, unknown, wait=wait):
+            resolved[uid] = (entity, exc)
+        return [(uid, *resolved[uid]) for uid in user_ids]
 
     def _run_async_task(self, coro: Awaitable[object]) -> object:
         loop = asyncio.new_event_loop()
@@ -978,6 +1457,59 @@ class MainWindow(QMainWindow):
         finally:
             loop.close()
 
+    def pick_source_file(self, key: str) -> None:
+        p, _ = QFileDialog.getOpenFileName(self, "Выберите файл со списком", "", "Списки (*.txt *.csv)")
+        if not p:
+            return
+        if not Path(p).is_file():
+            self.show_error(f"Файл не найден: {p}")
+            return
+        # sha256 заполнит первое потоковое чтение при запуске — здесь файл целиком не читается.
+        source = FileSource(p)
+        self._set_file_source(key, source)
+        self._save_settings()
+        self.log(f"Список будет читаться из файла: {p}")
+
+    def clear_source_file(self, key: str) -> None:
+        if key not in self._file_sources:
+            return
+        self._set_file_source(key, None)
+        self._save_settings()
+
+    def _set_file_source(self, key: str, source: Optional[FileSource]) -> None:
+        widget = self._source_inputs[key]
+        if source is None:
+            self._file_sources.pop(key, None)
+            widget.setReadOnly(False)
+            widget.clear()
+            return
+        self._file_sources[key] = source
+        widget.setReadOnly(True)
+        widget.setPlainText(self._file_source_summary(source))
+
+    @staticmethod
+    def _file_source_summary(source: FileSource) -> str:
+        try:
+            size = f"{source.size_bytes() / 1024:.1f} КБ"
+        except OSError:
+            size = "файл недоступен"
+        return f"Файл: {Path(source.path).name} ({size})\n{source.path}\nsha256: {source.sha256[:16] or '—'}"
+
+    def _member_source(self, key: str) -> str | Iterable[str]:
+        source = self._file_sources.get(key)
+        if source is None:
+            return self._source_inputs[key].toPlainText()
+        return self._iter_file_source(key, source)
+
+    def _iter_file_source(self, key: str, source: FileSource) -> Iterator[str]:
+        known_sha256 = source.sha256
+        yield from source.iter_lines(FILE_SOURCE_KINDS[key])
+        if source.sha256 != known_sha256:
+            if known_sha256:
+                self.log(f"Файл {source.path} изменился после выбора, хэш обновлён")
+            self._source_inputs[key].setPlainText(self._file_source_summary(source))
+            self._save_settings()
+
     def pick_photo(self) -> None:
         p, _ = QFileDialog.getOpenFileName(self, "Выберите фото", "", "Images (*.jpg *.jpeg *.png *.webp)")
         if p:
@@ -1042,7 +1574,8 @@ class MainWindow(QMainWindow):
 
             def finalize() -> None:
                 self._update_request_in_flight = False
-                self._handle_update_payload(payload)
+                with self._stall_monitor.track("_handle_update_payload"):
+                    self._handle_update_payload(payload)
 
             QTimer.singleShot(0, finalize)
 
@@ -1156,14 +1689,10 @@ class MainWindow(QMainWindow):
         self.run_task(job, success_cb=lambda msg: self.log(str(msg)))
 
     def add_users_without_groups(self) -> None:
-        contacts_raw = self.contacts_input.toPlainText()
-        refs_raw = self.usernames_input.toPlainText()
-        ids_raw = self.user_ids_input.toPlainText()
-
         try:
-            contacts = self.parse_contacts(contacts_raw) if contacts_raw.strip() else []
-            refs = self.parse_user_refs(refs_raw) if refs_raw.strip() else []
-            user_ids = self.parse_user_ids(ids_raw) if ids_raw.strip() else []
+            contacts = self.parse_contacts(self._member_source("contacts"))
+            refs = self.parse_user_refs(self._member_source("usernames"))
+            user_ids = self.parse_user_ids(self._member_source("user_ids"))
         except Exception as exc:  # noqa: BLE001
             self.show_error(str(exc), exc)
             return
@@ -1183,8 +1712,9 @@ class MainWindow(QMainWindow):
                     ]
                     if contacts:
                         logs.append("Импорт контактов: старт")
-                        await self.wait_contacts_delay()
-                        batch = [InputPhoneContact(client_id=i + 1, phone=c.phone, first_name=c.first_name, last_name=c.last_name) for i, c in enumerate(contacts)]
+                        batch = await self.wait_contacts_delay(
+                            lambda: [InputPhoneContact(client_id=i + 1, phone=c.phone, first_name=c.first_name, last_name=c.last_name) for i, c in enumerate(contacts)]
+                        )
                         imported = await client(ImportContactsRequest(batch))
                         logs.append(f"Импорт контактов: отправлено {len(batch)}")
                         logs.append(f"Импортировано контактов: {len(contacts)}")
@@ -1193,13 +1723,12 @@ class MainWindow(QMainWindow):
                     if refs:
                         logs.append("Проверка username/ссылок: старт")
                         ok, fail = 0, 0
-                        for ref in refs:
-                            await self.wait_contacts_delay()
-                            try:
-                                await self._get_entity_with_retry(client, ref)
+                        resolved = await self._resolve_entities_paced(client, refs, wait=self.wait_contacts_delay)
+                        for ref, _, exc in resolved:
+                            if exc is None:
                                 ok += 1
                                 logs.append(f"username/link OK: {ref}")
-                            except Exception as exc:
+                            else:
                                 fail += 1
                                 logs.append(f"username/link FAIL: {ref} ({exc})")
                         logs.append(f"Проверка username/ссылок: ok={ok}, fail={fail}")
@@ -1207,13 +1736,12 @@ class MainWindow(QMainWindow):
                     if user_ids:
                         logs.append("Проверка user ID: старт")
                         ok_ids, fail_ids = 0, 0
-                        for uid in user_ids:
-                            await self.wait_contacts_delay()
-                            try:
-                                await self._get_entity_with_retry(client, uid)
+                        resolved = await self._resolve_user_ids_batched(client, user_ids, wait=self.wait_contacts_delay)
+                        for uid, _, exc in resolved:
+                            if exc is None:
                                 ok_ids += 1
                                 logs.append(f"user ID OK: {uid}")
-                            except Exception as exc:
+                            else:
                                 fail_ids += 1
                                 logs.append(f"user ID FAIL: {uid} ({exc})")
                         logs.append(f"Проверка user ID: ok={ok_ids}, fail={fail_ids}")
@@ -1284,18 +1812,18 @@ class MainWindow(QMainWindow):
         add_members = add_members and self.use_members_checkbox.isChecked()
         try:
             contacts = (
-                self.parse_contacts(self.group_contacts_input.toPlainText())
-                if add_members and self.group_use_contacts_checkbox.isChecked() and self.group_contacts_input.toPlainText().strip()
+                self.parse_contacts(self._member_source("group_contacts"))
+                if add_members and self.group_use_contacts_checkbox.isChecked()
                 else []
             )
             refs = (
-                self.parse_user_refs(self.group_usernames_input.toPlainText())
-                if add_members and self.group_use_usernames_checkbox.isChecked() and self.group_usernames_input.toPlainText().strip()
+                self.parse_user_refs(self._member_source("group_usernames"))
+                if add_members and self.group_use_usernames_checkbox.isChecked()
                 else []
             )
             user_ids = (
-                self.parse_user_ids(self.group_user_ids_input.toPlainText())
-                if add_members and self.group_use_ids_checkbox.isChecked() and self.group_user_ids_input.toPlainText().strip()
+                self.parse_user_ids(self._member_source("group_user_ids"))
+                if add_members and self.group_use_ids_checkbox.isChecked()
                 else []
             )
 
@@ -1349,53 +1877,63 @@ class MainWindow(QMainWindow):
                     if add_members:
                         if contacts:
                             logs.append(f"Подготовка участников из контактов: {len(contacts)}")
-                            await self.wait_contacts_delay()
-                            batch = [InputPhoneContact(client_id=i + 1, phone=c.phone, first_name=c.first_name, last_name=c.last_name) for i, c in enumerate(contacts)]
+                            batch = await self.wait_contacts_delay(
+                                lambda: [InputPhoneContact(client_id=i + 1, phone=c.phone, first_name=c.first_name, last_name=c.last_name) for i, c in enumerate(contacts)]
+                            )
                             imported = await client(ImportContactsRequest(batch))
                             from_contacts = [u for u in imported.users if not getattr(u, "bot", False)]
                             users_to_invite.extend(from_contacts)
                             logs.append(f"Получено пользователей из контактов: {len(from_contacts)}")
 
-                        for ref in refs:
-                            await self.wait_contacts_delay()
-                            try:
-                                ent = await self._get_entity_with_retry(client, ref)
-                                if not getattr(ent, "bot", False):
-                                    users_to_invite.append(ent)
-                                    logs.append(f"Добавлен кандидат по username/link: {ref}")
-                            except Exception as exc:
+                        resolved = await self._resolve_entities_paced(client, refs, wait=self.wait_contacts_delay)
+                        for ref, ent, exc in resolved:
+                            if exc is not None:
                                 logs.append(f"Не удалось получить username/link {ref}: {exc}")
+                            elif not getattr(ent, "bot", False):
+                                users_to_invite.append(ent)
+                                logs.append(f"Добавлен кандидат по username/link: {ref}")
 
-                        for uid in user_ids:
-                            await self.wait_contacts_delay()
-                            try:
-                                ent = await self._get_entity_with_retry(client, uid)
-                                if not getattr(ent, "bot", False):
-                                    users_to_invite.append(ent)
-                                    logs.append(f"Добавлен кандидат по user ID: {uid}")
-                            except Exception as exc:
+                        resolved = await self._resolve_user_ids_batched(client, user_ids, wait=self.wait_contacts_delay)
+                        for uid, ent, exc in resolved:
+                            if exc is not None:
                                 logs.append(f"Не удалось получить user ID {uid}: {exc}")
+                            elif not getattr(ent, "bot", False):
+                                users_to_invite.append(ent)
+                                logs.append(f"Добавлен кандидат по user ID: {uid}")
 
                         uniq = {getattr(u, "id", None): u for u in users_to_invite if getattr(u, "id", None) is not None}
                         users_to_invite = list(uniq.values())
                         logs.append(f"Подготовлено участников после дедупликации: {len(users_to_invite)}")
 
+                    gname = title
+
+                    def _build_create_request() -> object:
+                        if is_basic_group:
+                            if not users_to_invite:
+                                raise ValueError("Для создания обычной группы нужен хотя бы 1 участник")
+                            messages_mod = import_module("telethon.tl.functions.messages")
+                            create_chat_request = getattr(messages_mod, "CreateChatRequest")
+                            return create_chat_request(users=users_to_invite, title=gname)
+                        return CreateChannelRequest(title=gname, about=about, megagroup=True, forum=is_forum)
+
+                    def _build_topic_request(peer: object) -> object:
+                        messages_mod = import_module("telethon.tl.functions.messages")
+                        create_topic_request = getattr(messages_mod, "CreateForumTopicRequest")
+                        return create_topic_request(peer=peer, title=topic_title)
+
+                    def _check_photo() -> None:
+                        if not Path(photo).exists():
+                            raise ValueError(f"Файл фото не найден: {photo}")
+
                     for idx in targets:
-                        await self.wait_groups_delay()
-                        gname = title
                         channel = None
                         try:
+                            create_request = await self.wait_groups_delay(_build_create_request)
+                            res = await client(create_request)
+                            channel = res.chats[0]
                             if is_basic_group:
-                                if not users_to_invite:
-                                    raise ValueError("Для создания обычной группы нужен хотя бы 1 участник")
-                                messages_mod = import_module("telethon.tl.functions.messages")
-                                create_chat_request = getattr(messages_mod, "CreateChatRequest")
-                                res = await client(create_chat_request(users=users_to_invite, title=gname))
-                                channel = res.chats[0]
                                 logs.append(f"[{idx + 1}] Создана обычная группа: {gname}")
                             else:
-                                res = await client(CreateChannelRequest(title=gname, about=about, megagroup=True, forum=is_forum))
-                                channel = res.chats[0]
                                 logs.append(f"[{idx + 1}] Создана супергруппа: {gname}")
                             stats["created_ok"] += 1
                         except Exception as exc:
@@ -1406,10 +1944,8 @@ class MainWindow(QMainWindow):
 
                         if is_forum and topic_title and channel is not None:
                             try:
-                                await self.wait_groups_delay()
-                                messages_mod = import_module("telethon.tl.functions.messages")
-                                create_topic_request = getattr(messages_mod, "CreateForumTopicRequest")
-                                await client(create_topic_request(peer=channel, title=topic_title))
+                                topic_request = await self.wait_groups_delay(lambda: _build_topic_request(channel))
+                                await client(topic_request)
                                 logs.append(f"[{idx + 1}] Создана тема: {topic_title}")
                                 stats["topic_ok"] += 1
                             except Exception as exc:
@@ -1419,10 +1955,7 @@ class MainWindow(QMainWindow):
 
                         if photo and channel is not None:
                             try:
-                                p = Path(photo)
-                                if not p.exists():
-                                    raise ValueError(f"Файл фото не найден: {photo}")
-                                await self.wait_groups_delay()
+                                await self.wait_groups_delay(_check_photo)
                                 uploaded = await client.upload_file(photo)
                                 await client(EditPhotoRequest(channel=channel, photo=InputChatUploadedPhoto(uploaded)))
                                 stats["photo_ok"] += 1
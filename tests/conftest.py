@@ -0,0 +1,96 @@
+import sys
+import types
+from pathlib import Path
+
+# Allow importing repository root module
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+
+# ---- Lightweight stubs for optional heavy deps (PySide6, telethon) ----
+if "PySide6" not in sys.modules:
+    pyside6 = types.ModuleType("PySide6")
+    qtcore = types.ModuleType("PySide6.QtCore")
+    qtwidgets = types.ModuleType("PySide6.QtWidgets")
+
+    class _Dummy:
+        def __init__(self, *args, **kwargs):
+            pass
+
+    class _QLineEdit(_Dummy):
+        class EchoMode:
+            Password = 1
+
+    for name in ["QObject", "QRunnable", "QThreadPool", "QTimer", "Signal"]:
+        setattr(qtcore, name, _Dummy)
+
+    for name, cls in {
+        "QApplication": _Dummy,
+        "QCheckBox": _Dummy,
+        "QComboBox": _Dummy,
+        "QFileDialog": _Dummy,
+        "QFormLayout": _Dummy,
+        "QGroupBox": _Dummy,
+        "QHBoxLayout": _Dummy,
+        "QLabel": _Dummy,
+        "QLineEdit": _QLineEdit,
+        "QMainWindow": _Dummy,
+        "QMessageBox": _Dummy,
+        "QPushButton": _Dummy,
+        "QPlainTextEdit": _Dummy,
+        "QSpinBox": _Dummy,
+        "QTabWidget": _Dummy,
+        "QVBoxLayout": _Dummy,
+        "QWidget": _Dummy,
+    }.items():
+        setattr(qtwidgets, name, cls)
+
+    sys.modules["PySide6"] = pyside6
+    sys.modules["PySide6.QtCore"] = qtcore
+    sys.modules["PySide6.QtWidgets"] = qtwidgets
+
+if "telethon" not in sys.modules:
+    telethon = types.ModuleType("telethon")
+    telethon.TelegramClient = object
+
+    errors = types.ModuleType("telethon.errors")
+    errors.SessionPasswordNeededError = Exception
+    errors.FloodWaitError = Exception
+
+    ch_funcs = types.ModuleType("telethon.tl.functions.channels")
+    ch_funcs.CreateChannelRequest = object
+    ch_funcs.EditPhotoRequest = object
+    ch_funcs.InviteToChannelRequest = object
+
+    c_funcs = types.ModuleType("telethon.tl.functions.contacts")
+    c_funcs.ImportContactsRequest = object
+
+    types_mod = types.ModuleType("telethon.tl.types")
+    types_mod.InputChatUploadedPhoto = object
+    types_mod.InputPhoneContact = object
+
+    sys.modules["telethon"] = telethon
+    sys.modules["telethon.errors"] = errors
+    sys.modules["telethon.tl.functions.channels"] = ch_funcs
+    sys.modules["telethon.tl.functions.contacts"] = c_funcs
+    sys.modules["telethon.tl.types"] = types_mod
+
+
+def pytest_addoption(parser) -> None:
+    group = parser.getgroup("benchmark")
+    group.addoption("--benchmark", action="store_true", default=False, help="Запустить бенчмарки горячих путей")
+    group.addoption(
+        "--benchmark-update",
+        action="store_true",
+        default=False,
+        help="Перезаписать tests/benchmark_baseline.json текущими результатами",
+    )
+    group.addoption(
+        "--benchmark-tolerance",
+        type=float,
+        default=0.3,
+        help="Допустимое замедление относительно базовой линии (0.3 = +30%%); на шумных машинах увеличьте",
+    )
+
+    group = parser.getgroup("soak")
+    group.addoption("--soak", action="store_true", default=False, help="Запустить soak-прогон окна (нужен PySide6)")
+    group.addoption("--soak-seconds", type=float, default=120.0, help="Длительность soak-прогона в секундах")
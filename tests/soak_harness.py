@@ -0,0 +1,304 @@
+# Soak-прогон окна без дисплея: python tests/soak_harness.py --hours 4
+# Окно работает на offscreen-платформе Qt с фейковым Telegram-клиентом и локальной заглушкой
+# сервера обновлений. Периодически снимаются RSS, потоки, открытые дескрипторы и живые
+# asyncio-задачи/циклы; при устойчивом росте любой метрики, кроме известных (KNOWN_LEAKS),
+# процесс завершается с кодом 1.
+import argparse
+import asyncio
+import gc
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import types
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from importlib import import_module
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# metric -> (допустимый абсолютный рост, допустимый относительный рост)
+GROWTH_TOLERANCES: dict[str, tuple[float, float]] = {
+    "rss_kb": (20 * 1024, 0.15),
+    "threads": (2, 0.0),
+    "fds": (5, 0.0),
+    "asyncio_tasks": (2, 0.0),
+    "event_loops": (1, 0.0),
+    "log_blocks": (1000, 0.0),
+}
+# Известные утечки: попадают в отчёт отдельно (known_leaks) и не валят прогон.
+KNOWN_LEAKS: dict[str, str] = {
+    "log_blocks": "лог окна не ограничен (setMaximumBlockCount(0)), ограничивается только --log-limit",
+}
+WARMUP_FRACTION = 0.2
+MIN_SAMPLES = 8
+
+
+def _proc_status_value(field: str) -> int | None:
+    try:
+        for line in Path("/proc/self/status").read_text(encoding="utf-8").splitlines():
+            if line.startswith(f"{field}:"):
+                return int(line.split()[1])
+    except (OSError, ValueError):
+        return None
+    return None
+
+
+def sample_metrics() -> dict[str, float]:
+    try:
+        psutil = import_module("psutil")
+    except ImportError:
+        psutil = None
+
+    if psutil is not None:
+        process = psutil.Process()
+        rss_kb = process.memory_info().rss / 1024
+        threads = process.num_threads()
+        fds = process.num_fds() if hasattr(process, "num_fds") else process.num_handles()
+    else:
+        rss_kb = _proc_status_value("VmRSS") or 0
+        threads = _proc_status_value("Threads") or threading.active_count()
+        fd_dir = Path("/proc/self/fd")
+        fds = len(os.listdir(fd_dir)) if fd_dir.exists() else 0
+
+    # Живые, но уже никому не нужные задачи и незакрытые циклы видны только через gc.
+    objects = gc.get_objects()
+    tasks = sum(1 for o in objects if isinstance(o, asyncio.Task))
+    loops = sum(1 for o in objects if isinstance(o, asyncio.AbstractEventLoop) and not o.is_closed())
+    return {
+        "rss_kb": float(rss_kb),
+        "threads": float(threads),
+        "fds": float(fds),
+        "asyncio_tasks": float(tasks),
+        "event_loops": float(loops),
+    }
+
+
+def sustained_growth(values: list[float], abs_tolerance: float, rel_tolerance: float) -> float | None:
+    # Рост считается устойчивым, если медиана последней четверти (после прогрева) выше медианы первой
+    # больше допуска и ряд в целом не убывает — одиночные пики GC/аллокатора так не срабатывают.
+    steady = values[int(len(values) * WARMUP_FRACTION):]
+    if len(steady) < MIN_SAMPLES:
+        return None
+    quarter = max(1, len(steady) // 4)
+    head = statistics.median(steady[:quarter])
+    tail = statistics.median(steady[-quarter:])
+    growth = tail - head
+    if growth <= max(abs_tolerance, head * rel_tolerance):
+        return None
+    middle = statistics.median(steady[quarter:-quarter] or steady)
+    if not head <= middle <= tail:
+        return None
+    return growth
+
+
+def find_leaks(samples: list[dict[str, float]]) -> dict[str, float]:
+    leaks: dict[str, float] = {}
+    for metric, (abs_tolerance, rel_tolerance) in GROWTH_TOLERANCES.items():
+        if not samples or metric not in samples[0]:
+            continue
+        growth = sustained_growth([s[metric] for s in samples], abs_tolerance, rel_tolerance)
+        if growth is not None:
+            leaks[metric] = growth
+    return leaks
+
+
+class FakeTelegramClient:
+    # Повторяет ту часть API Telethon, которой пользуется main.py, без сети и файлов сессии.
+    def __init__(self, session: str, api_id: int, api_hash: str, proxy: object = None) -> None:
+        # Все ID считаются известными сессии, как у давно работающего аккаунта.
+        self.session = types.SimpleNamespace(filename=session, get_input_entity=lambda value: value)
+        self._next_id = 1000
+
+    def _user(self, value: object) -> types.SimpleNamespace:
+        return types.SimpleNamespace(id=hash(value) & 0xFFFFFFF, bot=False, username=str(value))
+
+    async def connect(self) -> None:
+        await asyncio.sleep(0)
+
+    async def disconnect(self) -> None:
+        await asyncio.sleep(0)
+
+    async def is_user_authorized(self) -> bool:
+        return True
+
+    async def send_code_request(self, phone: str) -> types.SimpleNamespace:
+        return types.SimpleNamespace(phone_code_hash=f"hash-{phone}")
+
+    async def get_entity(self, value: object) -> object:
+        if isinstance(value, list):
+            return [self._user(v) for v in value]
+        return self._user(value)
+
+    async def upload_file(self, path: str) -> object:
+        return types.SimpleNamespace(path=path)
+
+    async def __call__(self, request: object) -> types.SimpleNamespace:
+        self._next_id += 1
+        return types.SimpleNamespace(users=[self._user(self._next_id)], chats=[types.SimpleNamespace(id=self._next_id)])
+
+
+class _UpdateHandler(BaseHTTPRequestHandler):
+    requests_served = 0
+
+    def do_GET(self) -> None:  # noqa: N802
+        type(self).requests_served += 1
+        if self.path != "/update-command":
+            self.send_error(404)
+            return
+        action = "notify" if self.requests_served % 10 == 0 else "none"
+        body = json.dumps({"action": action, "message": "soak"}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        return
+
+
+def start_update_server() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _UpdateHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_soak(
+    duration_s: float,
+    *,
+    sample_interval_s: float,
+    step_interval_ms: int,
+    poll_interval_ms: int,
+    log_limit: int,
+) -> dict[str, object]:
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    sys.path.insert(0, str(ROOT))
+    from PySide6.QtCore import QTimer
+    from PySide6.QtWidgets import QApplication, QMessageBox
+
+    import main
+
+    class _HeadlessMessageBox(QMessageBox):
+        information = staticmethod(lambda *args, **kwargs: QMessageBox.StandardButton.Ok)
+        question = staticmethod(lambda *args, **kwargs: QMessageBox.StandardButton.No)
+
+    workdir = Path(tempfile.mkdtemp(prefix="tgapp-soak-"))
+    main.SETTINGS_FILE = workdir / "app_settings.json"
+    main.TelegramClient = FakeTelegramClient
+    main.QMessageBox = _HeadlessMessageBox
+
+    server = start_update_server()
+    app = QApplication.instance() or QApplication([])
+    window = main.MainWindow()
+    if log_limit > 0:
+        # Только по явному флагу: ограничение лога отличает прочие утечки от роста самого лога,
+        # но не совпадает с тем, как приложение работает у операторов.
+        window.log_output.setMaximumBlockCount(log_limit)
+
+    window.api_id_input.setText("12345")
+    window.api_hash_input.setText("soak-hash")
+    window.account_phone_input.setText("+79990001122")
+    window.usernames_input.setPlainText("\n".join(f"@soak_user{i}" for i in range(20)))
+    window.user_ids_input.setPlainText("\n".join(str(100000 + i) for i in range(20)))
+    for spin in (
+        window.auth_delay_spin,
+        window.contacts_delay_min_spin,
+        window.contacts_delay_max_spin,
+        window.groups_delay_min_spin,
+        window.groups_delay_max_spin,
+    ):
+        spin.setValue(0)
+    window.group_count_spin.setValue(3)
+    # «Обычная группа» без участников отклоняется проверкой формы — супергруппа проходит весь путь создания.
+    window.group_type_combo.setCurrentIndex(window.group_type_combo.findData("normal"))
+    window.update_ask_user_checkbox.setChecked(False)
+    window.ip_update_input.setText(f"127.0.0.1:{server.server_address[1]}")
+    window._update_poll_timer.setInterval(poll_interval_ms)
+    window.update_poll_checkbox.setChecked(True)
+
+    steps = [
+        window.add_users_without_groups,
+        lambda: window.create_groups(add_members=False),
+        window.request_code,
+        lambda: window.topic_custom_input.setText(f"soak {time.monotonic():.0f}"),
+    ]
+    state = {"step": 0}
+    samples: list[dict[str, float]] = []
+
+    def do_step() -> None:
+        steps[state["step"] % len(steps)]()
+        state["step"] += 1
+
+    def take_sample() -> None:
+        gc.collect()
+        samples.append({**sample_metrics(), "log_blocks": float(window.log_output.blockCount())})
+
+    step_timer = QTimer()
+    step_timer.setInterval(step_interval_ms)
+    step_timer.timeout.connect(do_step)
+    sample_timer = QTimer()
+    sample_timer.setInterval(int(sample_interval_s * 1000))
+    sample_timer.timeout.connect(take_sample)
+
+    take_sample()
+    step_timer.start()
+    sample_timer.start()
+    QTimer.singleShot(int(duration_s * 1000), app.quit)
+    app.exec()
+
+    step_timer.stop()
+    sample_timer.stop()
+    window._update_poll_timer.stop()
+    server.shutdown()
+    server.server_close()
+    take_sample()
+    found = find_leaks(samples)
+
+    return {
+        "duration_s": duration_s,
+        "steps": state["step"],
+        "update_requests": _UpdateHandler.requests_served,
+        "samples": len(samples),
+        "first": samples[0],
+        "last": samples[-1],
+        "max_ui_stall_ms": round(window._stall_monitor.max_lateness_ms, 1),
+        "log_limit": log_limit,
+        "leaks": {metric: growth for metric, growth in found.items() if metric not in KNOWN_LEAKS},
+        "known_leaks": {metric: growth for metric, growth in found.items() if metric in KNOWN_LEAKS},
+    }
+
+
+def main_cli(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Soak-прогон MainWindow без дисплея")
+    parser.add_argument("--hours", type=float, default=0.0)
+    parser.add_argument("--seconds", type=float, default=60.0, help="используется, если --hours не задан")
+    parser.add_argument("--sample-interval", type=float, default=2.0, help="секунды между замерами")
+    parser.add_argument("--step-interval", type=int, default=50, help="мс между действиями пользователя")
+    parser.add_argument("--poll-interval", type=int, default=200, help="мс между опросами сервера обновлений")
+    parser.add_argument(
+        "--log-limit",
+        type=int,
+        default=0,
+        help="ограничить лог окна N блоками, чтобы искать прочие утечки (по умолчанию без ограничения, как в приложении)",
+    )
+    args = parser.parse_args(argv)
+
+    duration_s = args.hours * 3600 if args.hours > 0 else args.seconds
+    report = run_soak(
+        duration_s,
+        sample_interval_s=args.sample_interval,
+        step_interval_ms=args.step_interval,
+        poll_interval_ms=args.poll_interval,
+        log_limit=args.log_limit,
+    )
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    return 1 if report["leaks"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,296 @@
+import asyncio
+import gc
+import json
+import math
+import re
+import statistics
+import time
+import types
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+import main
+from main import MainWindow, UiStallMonitor
+
+# Бенчмарки запускаются отдельно: pytest tests/test_benchmarks.py --benchmark
+# Новая базовая линия (после осознанного изменения производительности): добавить --benchmark-update
+BASELINE_FILE = Path(__file__).with_name("benchmark_baseline.json")
+SIZES = (1000, 2000, 4000, 8000)
+REPEATS = 9
+CALIBRATION_SIZE = 2000
+# Наклон log(время)/log(размер): 1.0 — линейно, 2.0 — квадратично. Запас на шум таймера.
+MAX_SCALING_EXPONENT = 1.3
+SETTINGS_SAVE_BUDGET_MS = 250
+
+
+class _Toggle:
+    def __init__(self, checked: bool):
+        self._checked = checked
+
+    def isChecked(self) -> bool:
+        return self._checked
+
+
+class _Line:
+    def __init__(self, value: str):
+        self._value = value
+
+    def text(self) -> str:
+        return self._value
+
+
+class _Plain:
+    def __init__(self, value: str):
+        self._value = value
+
+    def toPlainText(self) -> str:
+        return self._value
+
+
+class _Combo:
+    def __init__(self, value: str):
+        self._value = value
+
+    def currentData(self) -> str:
+        return self._value
+
+
+class _Spin:
+    def __init__(self, value: int):
+        self._value = value
+
+    def value(self) -> int:
+        return self._value
+
+
+def _contacts_text(n: int) -> str:
+    return "\n\n".join(f"Иванов Иван Иванович {i % 28 + 1:02d}.01.1990\nhttps://t.me/+7999{i:07d}" for i in range(n))
+
+
+def _refs_text(n: int) -> str:
+    formats = ("@user{}", "user{}", "https://t.me/user{}", "http://t.me/user{}/")
+    return "\n".join(formats[i % len(formats)].format(i) for i in range(n))
+
+
+def _ids_text(n: int) -> str:
+    return "\n".join(str(100000000 + i) for i in range(n))
+
+
+def _phones(n: int) -> list[str]:
+    formats = ("+7 (999) {:03d}-11-22", "8999{:03d}1122", "  +7999{:03d}1122  ")
+    return [formats[i % len(formats)].format(i % 1000) for i in range(n)]
+
+
+def _proxy_window() -> types.SimpleNamespace:
+    return types.SimpleNamespace(
+        proxy_enabled_checkbox=_Toggle(True),
+        proxy_host_input=_Line("127.0.0.1"),
+        proxy_type_combo=_Combo("socks5"),
+        proxy_port_spin=_Spin(1080),
+        proxy_username_input=_Line("user"),
+        proxy_password_input=_Line("pass"),
+    )
+
+
+def _settings_window(n: int) -> types.SimpleNamespace:
+    window = types.SimpleNamespace(
+        _loading_settings=False,
+        _stall_monitor=UiStallMonitor(),
+        api_id_input=_Line("123456"),
+        api_hash_input=_Line("0123456789abcdef"),
+        proxy_enabled_checkbox=_Toggle(False),
+        proxy_type_combo=_Combo("socks5"),
+        proxy_host_input=_Line(""),
+        proxy_port_spin=_Spin(1080),
+        proxy_username_input=_Line(""),
+        proxy_password_input=_Line(""),
+        ip_update_input=_Line(""),
+        update_poll_checkbox=_Toggle(False),
+        update_ask_user_checkbox=_Toggle(True),
+        account_phone_input=_Line("+79990001122"),
+        auth_delay_spin=_Spin(0),
+        contacts_delay_min_spin=_Spin(0),
+        contacts_delay_max_spin=_Spin(3),
+        contacts_random_delay_checkbox=_Toggle(True),
+        groups_delay_min_spin=_Spin(1),
+        groups_delay_max_spin=_Spin(5),
+        groups_random_delay_checkbox=_Toggle(True),
+        group_use_contacts_checkbox=_Toggle(True),
+        group_use_usernames_checkbox=_Toggle(True),
+        group_use_ids_checkbox=_Toggle(True),
+        group_contacts_input=_Plain(_contacts_text(n)),
+        group_usernames_input=_Plain(_refs_text(n)),
+        group_user_ids_input=_Plain(_ids_text(n)),
+        group_type_combo=_Combo("normal"),
+        topic_preset_combo=_Combo(""),
+        topic_custom_input=_Line(""),
+    )
+    window._file_sources = {}
+    window._source_inputs = {
+        "group_contacts": window.group_contacts_input,
+        "group_usernames": window.group_usernames_input,
+        "group_user_ids": window.group_user_ids_input,
+    }
+    window._input_text_for_settings = lambda key: MainWindow._input_text_for_settings(window, key)
+    window._settings_payload = lambda: MainWindow._settings_payload(window)
+    return window
+
+
+def _run_retry_async(n: int) -> None:
+    async def _inner() -> None:
+        for _ in range(n):
+            state = {"failed": False}
+
+            async def op() -> str:
+                if not state["failed"]:
+                    state["failed"] = True
+                    raise RuntimeError("temporary")
+                return "ok"
+
+            await MainWindow.retry_async(op, attempts=2, base_delay=0, retry_exceptions=(RuntimeError,))
+
+    asyncio.run(_inner())
+
+
+# name -> (подготовка входа размера n, измеряемый вызов)
+CASES: dict[str, tuple[Callable[[int], object], Callable[[object], object]]] = {
+    "parse_contacts": (_contacts_text, MainWindow.parse_contacts),
+    "parse_user_refs": (_refs_text, MainWindow.parse_user_refs),
+    "parse_user_ids": (_ids_text, MainWindow.parse_user_ids),
+    "normalize_phone": (_phones, lambda phones: [MainWindow.normalize_phone(p) for p in phones]),
+    "session_from_phone": (_phones, lambda phones: [MainWindow.session_from_phone(p) for p in phones]),
+    "retry_async": (lambda n: n, _run_retry_async),
+    "_build_proxy_config": (
+        lambda n: (_proxy_window(), n),
+        lambda args: [MainWindow._build_proxy_config(args[0]) for _ in range(args[1])],
+    ),
+    "_save_settings": (_settings_window, MainWindow._save_settings),
+}
+
+
+def _calibration_workload(n: int) -> None:
+    # Та же смесь операций, что в парсерах: регулярные выражения, strip/split, форматирование строк.
+    for i in range(n):
+        line = f"  Иванов  Иван {i % 28 + 1:02d}.01.1990 https://t.me/+7999{i:07d} ".strip()
+        re.search(r"(?:\+)?\d{10,15}", line)
+        re.sub(r"\s+", " ", line).split()
+
+
+def _paired_ratios(fn: Callable[[object], object], arg: object) -> list[float]:
+    # Эталонная нагрузка замеряется вплотную к каждому прогону: дрейф частоты и соседние процессы
+    # влияют на обе величины одинаково и сокращаются в отношении.
+    ratios: list[float] = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(REPEATS):
+            started = time.perf_counter()
+            _calibration_workload(CALIBRATION_SIZE)
+            unit = time.perf_counter() - started
+            started = time.perf_counter()
+            fn(arg)
+            ratios.append((time.perf_counter() - started) / unit)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return ratios
+
+
+def _measure(fn: Callable[[object], object], inputs: dict[int, object]) -> tuple[float, float]:
+    # Медиана, а не лучший прогон: одиночный удачный или неудачный замер не сдвигает результат.
+    # Результат в единицах эталонной нагрузки на элемент, чтобы базовая линия переносилась между машинами.
+    relative = {n: statistics.median(_paired_ratios(fn, arg)) for n, arg in inputs.items()}
+    per_item = relative[SIZES[-1]] / SIZES[-1] * CALIBRATION_SIZE
+    return per_item, _scaling_exponent(relative)
+
+
+def _scaling_exponent(timings: dict[int, float]) -> float:
+    sizes = sorted(timings)
+    xs = [math.log(n) for n in sizes]
+    ys = [math.log(max(timings[n], 1e-9)) for n in sizes]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    num = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    den = sum((x - mean_x) ** 2 for x in xs)
+    return num / den
+
+
+def _load_baseline() -> dict[str, dict[str, float]]:
+    if not BASELINE_FILE.exists():
+        return {}
+    return json.loads(BASELINE_FILE.read_text(encoding="utf-8"))
+
+
+@pytest.fixture(scope="module")
+def benchmark_results(request: pytest.FixtureRequest):
+    if not request.config.getoption("--benchmark"):
+        pytest.skip("бенчмарки запускаются с --benchmark")
+    results: dict[str, dict[str, float]] = {}
+    yield results
+    if request.config.getoption("--benchmark-update") and results:
+        baseline = _load_baseline()
+        baseline.update(results)
+        BASELINE_FILE.write_text(json.dumps(baseline, ensure_ascii=False, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+@pytest.fixture
+def benchmark_env(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    socks_stub = types.SimpleNamespace(SOCKS5=2, HTTP=3)
+    monkeypatch.setattr("main.import_module", lambda name: socks_stub)
+    monkeypatch.setattr("main.SETTINGS_FILE", tmp_path / "app_settings.json")
+
+
+def test_settings_window_covers_settings_payload(benchmark_env) -> None:
+    # Работает без --benchmark: новое поле настроек, которого нет в _settings_window, сломает этот тест сразу.
+    window = _settings_window(1)
+
+    payload = MainWindow._settings_payload(window)
+    MainWindow._save_settings(window)
+
+    assert payload["group_members"]["user_ids"] == _ids_text(1)
+    assert json.loads(main.SETTINGS_FILE.read_text(encoding="utf-8")) == payload
+
+
+def test_scaling_exponent_detects_quadratic_growth() -> None:
+    assert _scaling_exponent({n: n * 1e-6 for n in SIZES}) == pytest.approx(1.0)
+    assert _scaling_exponent({n: n * n * 1e-9 for n in SIZES}) == pytest.approx(2.0)
+
+
+@pytest.mark.parametrize("name", sorted(CASES))
+def test_benchmark_hot_path(name: str, benchmark_results, benchmark_env, request: pytest.FixtureRequest) -> None:
+    make_input, fn = CASES[name]
+    inputs = {n: make_input(n) for n in SIZES}
+    per_item, exponent = _measure(fn, inputs)
+    benchmark_results[name] = {"per_item_units": round(per_item, 3), "scaling_exponent": round(exponent, 3)}
+
+    if request.config.getoption("--benchmark-update"):
+        assert exponent <= MAX_SCALING_EXPONENT, f"{name}: сверхлинейный рост, показатель {exponent:.2f}"
+        return
+    baseline = _load_baseline().get(name)
+    if baseline is None:
+        pytest.fail(f"{name}: нет базовой линии, запустите с --benchmark-update")
+    tolerance = request.config.getoption("--benchmark-tolerance")
+    limit = baseline["per_item_units"] * (1 + tolerance)
+    if per_item > limit or exponent > MAX_SCALING_EXPONENT:
+        # Перед тем как объявить регрессию, перемеряем: одиночный выброс часто вызван шумом машины.
+        retry_per_item, retry_exponent = _measure(fn, inputs)
+        per_item = min(per_item, retry_per_item)
+        exponent = min(exponent, retry_exponent)
+
+    assert exponent <= MAX_SCALING_EXPONENT, f"{name}: сверхлинейный рост, показатель {exponent:.2f}"
+    assert per_item <= limit, f"{name}: {per_item:.2f} ед./элемент, базовая линия {baseline['per_item_units']:.2f} (+{tolerance:.0%})"
+
+
+def test_benchmark_settings_save_fits_ui_budget(benchmark_results, benchmark_env) -> None:
+    window = _settings_window(SIZES[-1])
+    monitor = UiStallMonitor(threshold_ms=SETTINGS_SAVE_BUDGET_MS)
+
+    # Сохранение настроек выполняется в UI-потоке: эмулируем тик heartbeat до и после.
+    monitor.record_tick()
+    with monitor.track("_save_settings"):
+        MainWindow._save_settings(window)
+    monitor.record_tick()
+
+    monitor.assert_max_block(SETTINGS_SAVE_BUDGET_MS)
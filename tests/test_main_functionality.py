@@ -1,84 +1,11 @@
 import asyncio
-import sys
+import hashlib
 import types
 from pathlib import Path
 
-# Allow importing repository root module
-sys.path.append(str(Path(__file__).resolve().parents[1]))
-
-
-# ---- Lightweight stubs for optional heavy deps (PySide6, telethon) ----
-if "PySide6" not in sys.modules:
-    pyside6 = types.ModuleType("PySide6")
-    qtcore = types.ModuleType("PySide6.QtCore")
-    qtwidgets = types.ModuleType("PySide6.QtWidgets")
-
-    class _Dummy:
-        def __init__(self, *args, **kwargs):
-            pass
-
-    class _QLineEdit(_Dummy):
-        class EchoMode:
-            Password = 1
-
-    for name in ["QObject", "QRunnable", "QThreadPool", "Signal"]:
-        setattr(qtcore, name, _Dummy)
-
-    for name, cls in {
-        "QApplication": _Dummy,
-        "QCheckBox": _Dummy,
-        "QComboBox": _Dummy,
-        "QFileDialog": _Dummy,
-        "QFormLayout": _Dummy,
-        "QGroupBox": _Dummy,
-        "QHBoxLayout": _Dummy,
-        "QLabel": _Dummy,
-        "QLineEdit": _QLineEdit,
-        "QMainWindow": _Dummy,
-        "QMessageBox": _Dummy,
-        "QPushButton": _Dummy,
-        "QPlainTextEdit": _Dummy,
-        "QSpinBox": _Dummy,
-        "QTabWidget": _Dummy,
-        "QVBoxLayout": _Dummy,
-        "QWidget": _Dummy,
-    }.items():
-        setattr(qtwidgets, name, cls)
-
-    sys.modules["PySide6"] = pyside6
-    sys.modules["PySide6.QtCore"] = qtcore
-    sys.modules["PySide6.QtWidgets"] = qtwidgets
-
-if "telethon" not in sys.modules:
-    telethon = types.ModuleType("telethon")
-    telethon.TelegramClient = object
-
-    errors = types.ModuleType("telethon.errors")
-    errors.SessionPasswordNeededError = Exception
-    errors.FloodWaitError = Exception
-
-    ch_funcs = types.ModuleType("telethon.tl.functions.channels")
-    ch_funcs.CreateChannelRequest = object
-    ch_funcs.EditPhotoRequest = object
-    ch_funcs.InviteToChannelRequest = object
-
-    c_funcs = types.ModuleType("telethon.tl.functions.contacts")
-    c_funcs.ImportContactsRequest = object
-
-    types_mod = types.ModuleType("telethon.tl.types")
-    types_mod.InputChatUploadedPhoto = object
-    types_mod.InputPhoneContact = object
-
-    sys.modules["telethon"] = telethon
-    sys.modules["telethon.errors"] = errors
-    sys.modules["telethon.tl.functions.channels"] = ch_funcs
-    sys.modules["telethon.tl.functions.contacts"] = c_funcs
-    sys.modules["telethon.tl.types"] = types_mod
-
-
 import pytest
 
-from main import MainWindow
+from main import FileSource, MainWindow, UiStallMonitor
 
 
 def test_parse_user_refs_normalizes_links_and_handles_at_prefix() -> None:
@@ -259,3 +186,313 @@ def test_build_proxy_config_builds_tuple_for_socks5(monkeypatch: pytest.MonkeyPa
 
     proxy = MainWindow._build_proxy_config(fake_window)
     assert proxy == (123, '127.0.0.1', 1080, True, 'user', 'pass')
+
+
+def test_ui_stall_monitor_attributes_stall_to_slowest_handler() -> None:
+    clock = {"now": 0.0}
+    stalls = []
+    monitor = UiStallMonitor(interval_ms=50, threshold_ms=200, on_stall=stalls.append, clock=lambda: clock["now"])
+
+    monitor.record_tick()
+    with monitor.track("fast"):
+        clock["now"] += 0.01
+    with monitor.track("_save_settings"):
+        clock["now"] += 0.6
+    lateness = monitor.record_tick()
+
+    assert round(lateness) == 560
+    assert [s.handler for s in stalls] == ["_save_settings"]
+    assert monitor.histogram["<=1000ms"] == 1
+
+
+def test_ui_stall_monitor_ignores_on_time_ticks_and_checks_budget() -> None:
+    clock = {"now": 0.0}
+    monitor = UiStallMonitor(interval_ms=50, threshold_ms=200, clock=lambda: clock["now"])
+
+    monitor.record_tick()
+    clock["now"] += 0.05
+    assert monitor.record_tick() == 0.0
+    assert monitor.stalls == []
+    monitor.assert_max_block(10)
+
+    with monitor.track("job"):
+        clock["now"] += 1.0
+    monitor.record_tick()
+    with pytest.raises(AssertionError, match="job"):
+        monitor.assert_max_block(500)
+
+
+def test_ui_stall_monitor_wrap_trims_signal_args_and_names_slot() -> None:
+    clock = {"now": 0.0}
+    stalls = []
+    calls = []
+    monitor = UiStallMonitor(interval_ms=50, threshold_ms=200, on_stall=stalls.append, clock=lambda: clock["now"])
+
+    def save() -> None:
+        calls.append("save")
+        clock["now"] += 0.5
+
+    slot = monitor.wrap("api_id_input.textChanged -> save", save)
+    monitor.record_tick()
+    slot("новый текст")
+    monitor.wrap("any", lambda *args: calls.append(args))(1, 2)
+    monitor.record_tick()
+
+    assert calls == ["save", (1, 2)]
+    assert [s.handler for s in stalls] == ["api_id_input.textChanged -> save"]
+
+
+def test_ui_stall_monitor_records_slow_handler_before_start() -> None:
+    clock = {"now": 0.0}
+    stalls = []
+    monitor = UiStallMonitor(interval_ms=50, threshold_ms=200, on_stall=stalls.append, clock=lambda: clock["now"])
+
+    with monitor.track("_load_settings"):
+        with monitor.track("_save_settings"):
+            clock["now"] += 0.3
+    with monitor.track("fast"):
+        clock["now"] += 0.01
+
+    assert [(round(s.lateness_ms), s.handler) for s in stalls] == [(300, "_load_settings")]
+
+
+def _resolver_window() -> types.SimpleNamespace:
+    fake_window = types.SimpleNamespace(retry_async=MainWindow.retry_async, log=lambda _: None)
+    fake_window._get_entity_with_retry = lambda client, value: MainWindow._get_entity_with_retry(fake_window, client, value)
+    fake_window._resolve_entities_paced = lambda client, values, wait=None: MainWindow._resolve_entities_paced(
+        fake_window, client, values, wait=wait
+    )
+    fake_window._is_cached_user_id = MainWindow._is_cached_user_id
+    return fake_window
+
+
+class _ResolverClient:
+    def __init__(self, cached_ids=(), missing=()):
+        self.calls = []
+        self.missing = set(missing)
+        cached = set(cached_ids)
+
+        def get_input_entity(value):
+            if value not in cached:
+                raise ValueError("not in session")
+            return value
+
+        self.session = types.SimpleNamespace(get_input_entity=get_input_entity)
+
+    async def get_entity(self, value):
+        self.calls.append(value)
+        values = value if isinstance(value, list) else [value]
+        for v in values:
+            if v in self.missing:
+                raise ValueError(f"no user {v}")
+        return [f"user:{v}" for v in values] if isinstance(value, list) else f"user:{value}"
+
+
+def test_resolve_user_ids_batched_uses_one_request_and_one_delay_per_batch() -> None:
+    waits = []
+
+    async def wait() -> None:
+        waits.append(1)
+
+    client = _ResolverClient(cached_ids=[1, 2, 3, 4, 5])
+    result = asyncio.run(
+        MainWindow._resolve_user_ids_batched(_resolver_window(), client, [1, 2, 3, 4, 5], wait=wait, batch_size=2)
+    )
+
+    assert client.calls == [[1, 2], [3, 4], [5]]
+    assert len(waits) == 3
+    assert result == [(v, f"user:{v}", None) for v in [1, 2, 3, 4, 5]]
+
+
+def test_resolve_user_ids_batched_keeps_unknown_ids_out_of_batches() -> None:
+    waits = []
+
+    async def wait() -> None:
+        waits.append(1)
+
+    client = _ResolverClient(cached_ids=[1, 2], missing=[9])
+    result = asyncio.run(MainWindow._resolve_user_ids_batched(_resolver_window(), client, [1, 9, 2], wait=wait))
+
+    assert client.calls == [[1, 2], 9]
+    assert len(waits) == 2
+    assert [(v, e) for v, e, _ in result] == [(1, "user:1"), (9, None), (2, "user:2")]
+    assert str(result[1][2]) == "no user 9"
+
+
+def test_resolve_user_ids_batched_falls_back_per_item_without_retrying_value_errors() -> None:
+    waits = []
+
+    async def wait() -> None:
+        waits.append(1)
+
+    client = _ResolverClient(cached_ids=[1, 2, 3], missing=[2])
+    result = asyncio.run(MainWindow._resolve_user_ids_batched(_resolver_window(), client, [1, 2, 3], wait=wait))
+
+    assert client.calls == [[1, 2, 3], 1, 2, 3]
+    assert len(waits) == 4
+    assert [e for _, e, _ in result] == ["user:1", None, "user:3"]
+
+
+def test_resolve_entities_paced_waits_before_each_username() -> None:
+    waits = []
+
+    async def wait() -> None:
+        waits.append(1)
+
+    client = _ResolverClient(missing=["missing"])
+    result = asyncio.run(
+        MainWindow._resolve_entities_paced(_resolver_window(), client, ["durov", "missing", "telegram"], wait=wait)
+    )
+
+    assert client.calls == ["durov", "missing", "telegram"]
+    assert len(waits) == 3
+    assert [(v, e) for v, e, _ in result] == [("durov", "user:durov"), ("missing", None), ("telegram", "user:telegram")]
+
+
+def test_retry_async_does_not_retry_giveup_exceptions() -> None:
+    state = {"calls": 0}
+
+    async def op() -> None:
+        state["calls"] += 1
+        raise ValueError("no such user")
+
+    with pytest.raises(ValueError, match="no such user"):
+        asyncio.run(MainWindow.retry_async(op, attempts=3, base_delay=0, giveup_exceptions=(ValueError,)))
+    assert state["calls"] == 1
+
+
+def test_sleep_while_preparing_counts_preparation_into_delay(monkeypatch: pytest.MonkeyPatch) -> None:
+    slept = []
+    real_sleep = asyncio.sleep
+
+    async def fake_sleep(delay: float) -> None:
+        slept.append(delay)
+        await real_sleep(0)
+
+    def prepare() -> str:
+        import time
+
+        time.sleep(0.05)
+        return "request"
+
+    monkeypatch.setattr("main.asyncio.sleep", fake_sleep)
+
+    result = asyncio.run(MainWindow._sleep_while_preparing(1, prepare))
+
+    assert result == "request"
+    assert len(slept) == 1
+    assert 0.5 < slept[0] <= 0.951
+
+
+def test_sleep_while_preparing_skips_sleep_without_delay(monkeypatch: pytest.MonkeyPatch) -> None:
+    slept = []
+
+    async def fake_sleep(delay: float) -> None:
+        slept.append(delay)
+
+    monkeypatch.setattr("main.asyncio.sleep", fake_sleep)
+
+    assert asyncio.run(MainWindow._sleep_while_preparing(0)) is None
+    assert slept == []
+
+
+def test_file_source_streams_lines_across_chunk_boundaries(tmp_path: Path) -> None:
+    data = "Иванов Иван Иванович 01.01.1990\r\nhttps://t.me/+79990001122\r\n\r\nПетров Петр\r\n79990001123".encode("utf-8")
+    path = tmp_path / "contacts.txt"
+    path.write_bytes(data)
+    source = FileSource(str(path))
+
+    contacts = MainWindow.parse_contacts(source.iter_lines("contacts", chunk_size=3))
+
+    assert [c.phone for c in contacts] == ["+79990001122", "+79990001123"]
+    assert source.sha256 == hashlib.sha256(data).hexdigest() == source.compute_sha256()
+
+
+def test_first_streamed_read_fills_file_source_hash_without_change_warning(tmp_path: Path) -> None:
+    path = tmp_path / "ids.txt"
+    path.write_text("123\n456\n", encoding="utf-8")
+    source = FileSource(str(path))
+    logs, saved = [], []
+    fake_window = types.SimpleNamespace(
+        _source_inputs={"user_ids": types.SimpleNamespace(setPlainText=lambda text: None)},
+        _file_source_summary=MainWindow._file_source_summary,
+        _save_settings=lambda: saved.append(source.sha256),
+        log=logs.append,
+    )
+
+    assert MainWindow.parse_user_ids(MainWindow._iter_file_source(fake_window, "user_ids", source)) == [123, 456]
+    assert saved == [hashlib.sha256(b"123\n456\n").hexdigest()]
+    assert logs == []
+
+
+def test_file_source_splits_long_lines_and_lone_cr_across_chunks(tmp_path: Path) -> None:
+    text = "a" * 1000 + "\rб\r\n\rc"
+    path = tmp_path / "refs.txt"
+    path.write_bytes(text.encode("utf-8"))
+
+    for chunk_size in (1, 2, 7, 1001):
+        source = FileSource(str(path))
+        assert list(source._iter_text_lines(chunk_size)) == text.splitlines()
+        assert list(source._iter_text_lines(chunk_size, keepends=True)) == text.splitlines(keepends=True)
+
+
+def test_file_source_reads_csv_cells_as_lines(tmp_path: Path) -> None:
+    path = tmp_path / "members.csv"
+    path.write_text('"Иванов Иван",https://t.me/+79990001122\nПетров Петр,+79990001123\n', encoding="utf-8")
+
+    contacts = MainWindow.parse_contacts(FileSource(str(path)).iter_lines("contacts"))
+
+    assert [(c.first_name, c.phone) for c in contacts] == [("Иванов Иван", "+79990001122"), ("Петров Петр", "+79990001123")]
+
+
+def test_file_source_csv_skips_header_and_picks_id_column(tmp_path: Path) -> None:
+    path = tmp_path / "ids.csv"
+    path.write_text("name,user_id\nИван,123\nПётр,456\n", encoding="utf-8")
+
+    assert MainWindow.parse_user_ids(FileSource(str(path)).iter_lines("user_ids")) == [123, 456]
+
+
+def test_file_source_csv_skips_unknown_id_header(tmp_path: Path) -> None:
+    path = tmp_path / "ids.csv"
+    path.write_text("Telegram\n123\n456\n", encoding="utf-8")
+
+    assert MainWindow.parse_user_ids(FileSource(str(path)).iter_lines("user_ids")) == [123, 456]
+
+
+def test_file_source_csv_uses_username_column_only(tmp_path: Path) -> None:
+    path = tmp_path / "refs.csv"
+    path.write_text("name;username\nИван Иванов;@durov\nПётр;https://t.me/telegram\n", encoding="utf-8")
+
+    assert MainWindow.parse_user_refs(FileSource(str(path)).iter_lines("usernames")) == ["durov", "telegram"]
+
+
+def test_file_source_csv_without_header_picks_username_column_by_content(tmp_path: Path) -> None:
+    path = tmp_path / "refs.csv"
+    path.write_text("Иван,@durov\nПётр,https://t.me/telegram\n", encoding="utf-8")
+
+    assert MainWindow.parse_user_refs(FileSource(str(path)).iter_lines("usernames")) == ["durov", "telegram"]
+
+
+def test_file_source_csv_without_header_finds_phone_first_contacts(tmp_path: Path) -> None:
+    path = tmp_path / "contacts.csv"
+    path.write_text("+79990001122,Иванов Иван\nhttps://t.me/+79990001123,Петров Петр\n", encoding="utf-8")
+
+    contacts = MainWindow.parse_contacts(FileSource(str(path)).iter_lines("contacts"))
+
+    assert [(c.first_name, c.phone) for c in contacts] == [("Иванов Иван", "+79990001122"), ("Петров Петр", "+79990001123")]
+
+
+def test_file_source_csv_keeps_newlines_inside_quoted_cells(tmp_path: Path) -> None:
+    path = tmp_path / "contacts.csv"
+    path.write_bytes('phone,name\r\n+79990001122,"Иванов\r\nИван"\r\n'.encode("utf-8"))
+
+    lines = list(FileSource(str(path)).iter_lines("contacts", chunk_size=4))
+
+    assert lines == ["Иванов\r\nИван", "+79990001122"]
+
+
+def test_parsers_accept_line_iterables() -> None:
+    assert MainWindow.parse_user_refs(iter(["@durov", "", "https://t.me/telegram"])) == ["durov", "telegram"]
+    assert MainWindow.parse_user_ids(iter(["1", "2"])) == [1, 2]
+    with pytest.raises(ValueError, match="Нет ссылки"):
+        MainWindow.parse_contacts(iter(["Иванов Иван"]))
@@ -0,0 +1,104 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from soak_harness import KNOWN_LEAKS, find_leaks, sample_metrics, sustained_growth
+
+HARNESS = Path(__file__).with_name("soak_harness.py")
+SOAK_LOG_LIMIT = 2000
+
+
+def test_sustained_growth_ignores_flat_series_with_spikes() -> None:
+    values = [100.0] * 30
+    values[12] = 400.0
+    values[25] = 300.0
+
+    assert sustained_growth(values, abs_tolerance=5, rel_tolerance=0.0) is None
+
+
+def test_sustained_growth_detects_steady_leak() -> None:
+    values = [100.0 + i for i in range(40)]
+
+    assert sustained_growth(values, abs_tolerance=5, rel_tolerance=0.0) == pytest.approx(24.0)
+
+
+def test_sustained_growth_needs_enough_samples() -> None:
+    assert sustained_growth([1.0, 50.0, 100.0], abs_tolerance=0, rel_tolerance=0.0) is None
+
+
+def test_find_leaks_reports_only_growing_metrics() -> None:
+    samples = [
+        {"rss_kb": 50000.0, "threads": 5.0 + i, "fds": 10.0, "asyncio_tasks": 0.0, "event_loops": 0.0}
+        for i in range(30)
+    ]
+
+    assert set(find_leaks(samples)) == {"threads"}
+
+
+def test_find_leaks_tracks_window_log_growth() -> None:
+    samples = [
+        {"rss_kb": 50000.0, "threads": 5.0, "fds": 10.0, "asyncio_tasks": 0.0, "event_loops": 0.0, "log_blocks": 200.0 * i}
+        for i in range(30)
+    ]
+
+    assert set(find_leaks(samples)) == {"log_blocks"}
+
+
+def test_sample_metrics_returns_all_tracked_values() -> None:
+    metrics = sample_metrics()
+
+    assert set(metrics) == {"rss_kb", "threads", "fds", "asyncio_tasks", "event_loops"}
+    assert metrics["threads"] >= 1
+
+
+def _run_soak_subprocess(request: pytest.FixtureRequest, *extra_args: str) -> tuple[dict, subprocess.CompletedProcess]:
+    if not request.config.getoption("--soak"):
+        pytest.skip("soak-прогон запускается с --soak")
+    # conftest подменяет PySide6 заглушками, поэтому окно гоняется в отдельном процессе с настоящим Qt.
+    has_qt = subprocess.run([sys.executable, "-c", "import PySide6.QtWidgets, telethon"], capture_output=True)
+    if has_qt.returncode != 0:
+        pytest.skip("для soak-прогона нужны PySide6 и telethon")
+
+    seconds = request.config.getoption("--soak-seconds")
+    env = {**os.environ, "QT_QPA_PLATFORM": "offscreen"}
+    proc = subprocess.run(
+        [
+            sys.executable,
+            str(HARNESS),
+            "--seconds",
+            str(seconds),
+            "--sample-interval",
+            str(max(1.0, seconds / 60)),
+            *extra_args,
+        ],
+        capture_output=True,
+        text=True,
+        env=env,
+        timeout=seconds + 120,
+    )
+
+    assert proc.stdout.strip(), f"soak-прогон не выдал отчёт (код {proc.returncode}):\n{proc.stderr[-4000:]}"
+    report = json.loads(proc.stdout)
+    assert report["steps"] > 0
+    return report, proc
+
+
+def test_soak_window_has_no_sustained_growth(request: pytest.FixtureRequest) -> None:
+    # Лог ограничен: его рост (известная утечка) иначе перекрывает рост RSS и прячет утечки потоков, FD и задач.
+    report, proc = _run_soak_subprocess(request, "--log-limit", str(SOAK_LOG_LIMIT))
+
+    assert report["leaks"] == {}, f"устойчивый рост: {report['leaks']}\n{proc.stderr[-2000:]}"
+    assert proc.returncode == 0
+
+
+@pytest.mark.xfail(reason=KNOWN_LEAKS["log_blocks"], strict=True)
+def test_soak_uncapped_window_log_does_not_grow(request: pytest.FixtureRequest) -> None:
+    # Известная утечка, отслеживается только по log_blocks: когда лог ограничат в приложении, тест
+    # начнёт проходить и strict xfail напомнит снять маркер.
+    report, _ = _run_soak_subprocess(request)
+
+    assert "log_blocks" not in report["known_leaks"]